@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
@@ -16,7 +17,16 @@ DEFAULT_CONFIG = {
     "detection": {
         "model": "yolo11m",
         "image_size": 640,
+        "batch_size": 1,
+        "detect_stride": 1,
         "device": None,
+        "precision": "fp16",
+        "loader_prefetch": "threads",
+        "loader_num_threads": 8,
+        "local_weight_cache_dir": None,
+        "tensorrt": False,
+        "int8_calibration_data": None,
+        "lazy_load": False,
     },
     "confidence": {
         "threshold": 0.25,
@@ -59,8 +69,6 @@ DEFAULT_CONFIG = {
 
 
 def load_config(config_path: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
-    config = DEFAULT_CONFIG.copy()
-    
     if config_path is None:
         # Search for config.yaml in project root
         project_root = Path(__file__).parent.parent.parent
@@ -68,9 +76,19 @@ def load_config(config_path: Optional[Union[str, Path]] = None) -> Dict[str, Any
     else:
         config_path = Path(config_path)
     
-    if not config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
         logger.warning(f"Config file not found at {config_path}, using defaults")
-        return config
+        return DEFAULT_CONFIG.copy()
+    
+    # Only re-parse the YAML when the file changed since the last load
+    return _load_config_file(config_path, mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_config_file(config_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    config = DEFAULT_CONFIG.copy()
     
     if yaml is None:
         logger.warning("PyYAML not installed. Install with: pip install pyyaml")
@@ -92,11 +110,19 @@ def load_config(config_path: Optional[Union[str, Path]] = None) -> Dict[str, Any
 def _deep_merge(base: Dict, update: Dict) -> Dict:
     result = base.copy()
     
-    for key, value in update.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
-        else:
-            result[key] = value
+    # Walk nested sections with an explicit stack; only sections present in
+    # both configs are copied, everything else is shared with base
+    pending = [(result, update)]
+    while pending:
+        target, changes = pending.pop()
+        for key, value in changes.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = current.copy()
+                target[key] = merged
+                pending.append((merged, value))
+            else:
+                target[key] = value
     
     return result
 
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from itertools import islice
 from typing import List
 
+import numpy as np
+
 from src.services.track import Track
 
 
@@ -14,6 +17,18 @@ class Activity:
     confidence: float
 
 
+# Results are immutable, so classifiers hand out shared instances
+STANDING = Activity("standing", 0.90)
+MOVING = Activity("moving", 0.90)
+STOPPED_SHORT_HISTORY = Activity("stopped", 0.85)
+STOPPED = Activity("stopped", 0.95)
+
+# Class codes stored on tracks so per-frame dispatch compares ints, not names
+CLASS_OTHER = 0
+CLASS_PERSON = 1
+CLASS_VEHICLE = 2
+
+
 class PersonClassifier:
     """Classifies person activity based on movement speed."""
     
@@ -21,9 +36,7 @@ class PersonClassifier:
         self.speed_threshold = speed_threshold
     
     def classify(self, speed: float) -> Activity:
-        if speed < self.speed_threshold:
-            return Activity("standing", 0.90)
-        return Activity("moving", 0.90)
+        return STANDING if speed < self.speed_threshold else MOVING
 
 
 class VehicleClassifier:
@@ -32,20 +45,19 @@ class VehicleClassifier:
     def __init__(self, displacement_threshold: float = 8.0, min_history: int = 5):
         self.displacement_threshold = displacement_threshold
         self.min_history = min_history
+        self._displacement_threshold_sq = displacement_threshold * displacement_threshold
     
     def classify(self, track: Track) -> Activity:
         history = getattr(track, "history", [])
         
         if len(history) < self.min_history:
-            return Activity("stopped", 0.85)
+            return STOPPED_SHORT_HISTORY
         
-        # Compute total displacement from start to end
+        # Compare squared displacement from start to end against the squared threshold
         start, end = history[0], history[-1]
-        displacement = math.hypot(end[0] - start[0], end[1] - start[1])
+        dx, dy = end[0] - start[0], end[1] - start[1]
         
-        if displacement < self.displacement_threshold:
-            return Activity("stopped", 0.95)
-        return Activity("moving", 0.90)
+        return STOPPED if dx * dx + dy * dy < self._displacement_threshold_sq else MOVING
 
 
 class ActivityClassifier:
@@ -53,6 +65,10 @@ class ActivityClassifier:
     
     PERSON_CLASSES = frozenset({"person"})
     VEHICLE_CLASSES = frozenset({"train", "truck", "bus", "car"})
+    CLASS_CODES = {
+        **dict.fromkeys(PERSON_CLASSES, CLASS_PERSON),
+        **dict.fromkeys(VEHICLE_CLASSES, CLASS_VEHICLE),
+    }
     
     def __init__(
         self,
@@ -66,26 +82,78 @@ class ActivityClassifier:
         self.window = window
         self.person = PersonClassifier(person_speed_threshold)
         self.vehicle = VehicleClassifier(vehicle_displacement_threshold, vehicle_min_history)
+        # Tracks from the last update_tracks call whose activity differs from
+        # the one last logged for them
+        self.changed_tracks: List[Track] = []
 
     def update_tracks(self, tracks: List[Track]) -> None:
+        self.changed_tracks = []
+        persons = []
         for track in tracks:
-            self._classify(track)
+            if track.cls_code == CLASS_PERSON:
+                persons.append(track)
+            else:
+                self._classify(track)
+        
+        # Person speeds are computed in one vectorized pass
+        for track, speed in zip(persons, self._compute_speeds(persons)):
+            self._apply(track, self.person.classify(speed))
 
     def _classify(self, track: Track) -> None:
-        cls_name = getattr(track, "cls_name", None)
+        code = track.cls_code
         
-        if cls_name in self.PERSON_CLASSES:
+        if code == CLASS_PERSON:
             speed = self._compute_speed(track)
             result = self.person.classify(speed)
-        elif cls_name in self.VEHICLE_CLASSES:
+        elif code == CLASS_VEHICLE:
             result = self.vehicle.classify(track)
         else:
             track.activity = None
             track.activity_conf = 0.0
             return
         
+        self._apply(track, result)
+
+    def _apply(self, track: Track, result: Activity) -> None:
         track.activity = result.label
         track.activity_conf = result.confidence
+        if result.label != track.previous_activity:
+            self.changed_tracks.append(track)
+
+    def _compute_speeds(self, tracks: List[Track]) -> List[float]:
+        """
+        Compute speeds for many tracks at once.
+        
+        Tracks with a full window are stacked into one (M, W, 2) array so the
+        distances and medians run in NumPy; shorter histories fall back to
+        _compute_speed.
+        """
+        window = self.window
+        speeds = [0.0] * len(tracks)
+        full = []
+        for i, track in enumerate(tracks):
+            if window >= 3 and len(track.history) >= window:
+                full.append(i)
+            else:
+                speeds[i] = self._compute_speed(track)
+        
+        if not full:
+            return speeds
+        
+        pts = np.array(
+            [list(islice(tracks[i].history, len(tracks[i].history) - window, None)) for i in full],
+            dtype=np.float32
+        )
+        steps = np.diff(pts, axis=1)
+        distances_sq = np.einsum("mwk,mwk->mw", steps, steps)
+        
+        # Same median as _compute_speed; sqrt is monotonic, so it is applied to
+        # the median squared distance only
+        mid = distances_sq.shape[1] // 2
+        medians = np.sqrt(np.partition(distances_sq, mid, axis=1)[:, mid]) * self.fps
+        for i, speed in zip(full, medians.tolist()):
+            speeds[i] = speed
+        return speeds
 
     def _compute_speed(self, track: Track) -> float:
         """Compute speed in pixels per second using median of recent distances."""
@@ -94,18 +162,20 @@ class ActivityClassifier:
         if len(history) < 3:
             return 0.0
         
-        pts = history[-self.window:]
-        distances = [
-            math.hypot(pts[i][0] - pts[i-1][0], pts[i][1] - pts[i-1][1])
-            for i in range(1, len(pts))
-        ]
+        # Index the last `window` points in place instead of slicing a copy
+        start = max(1, len(history) - self.window + 1)
+        distances_sq = []
+        for i in range(start, len(history)):
+            dx = history[i][0] - history[i-1][0]
+            dy = history[i][1] - history[i-1][1]
+            distances_sq.append(dx * dx + dy * dy)
         
-        if not distances:
+        if not distances_sq:
             return 0.0
         
-        # Use median to reduce noise
-        distances.sort()
-        median_distance = distances[len(distances) // 2]
+        # Use median to reduce noise; only the median needs a square root
+        distances_sq.sort()
+        median_distance = math.sqrt(distances_sq[len(distances_sq) // 2])
         return median_distance * self.fps
 
 
@@ -5,10 +5,12 @@ import multiprocessing
 import signal
 import sys
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import TYPE_CHECKING, Dict, List, Union
 
-from src.services.config import PipelineConfig
-from src.services.pipeline import Pipeline
+import orjson
+
+if TYPE_CHECKING:
+    from src.services.config import PipelineConfig
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +19,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _get_process_context():
+    """Prefer fork so camera processes inherit modules already imported by the parent."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
 class ProcessManager:
     
     def __init__(self):
@@ -72,8 +81,10 @@ class ConfigParser:
         return tuple(resize) if resize else None
     
     @staticmethod
-    def create_pipeline_config(config: Dict, source: Union[str, int]) -> PipelineConfig:
+    def create_pipeline_config(config: Dict, source: Union[str, int]) -> "PipelineConfig":
         """Create PipelineConfig from dictionary config."""
+        from src.services.config import PipelineConfig
+        
         return PipelineConfig(
             source=source,
             output=config.get('output'),
@@ -102,6 +113,9 @@ class CameraRunner:
         logger.info(f"Starting camera {camera_id} with source: {source}")
         
         try:
+            # Imported here so the CLI (--help, --create-config) does not load torch
+            from src.services.pipeline import Pipeline
+            
             pipeline_config = self._parser.create_pipeline_config(config, source)
             pipeline = Pipeline(pipeline_config, camera_id=camera_id)
             resize = self._parser.get_resize(config)
@@ -131,10 +145,10 @@ class ConfigLoader:
     @staticmethod
     def load(config_path: str) -> Dict[str, Dict]:
         """Load cameras configuration from JSON file."""
-        with open(config_path, 'r', encoding='utf-8') as f:
+        with open(config_path, 'rb') as f:
             try:
-                return json.load(f)
-            except json.JSONDecodeError as e:
+                return orjson.loads(f.read())
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Invalid JSON in config file: {e}")
                 raise
     
@@ -175,6 +189,7 @@ class CameraManager:
         self._config_loader = ConfigLoader()
         self._config_parser = ConfigParser()
         self._camera_runner = CameraRunner(self._config_parser)
+        self._mp_context = _get_process_context()
     
     def setup_signals(self):
         """Setup signal handlers for graceful shutdown."""
@@ -209,13 +224,26 @@ class CameraManager:
     def start_cameras(self, cameras: Dict[str, Dict], show: bool):
         """Start all camera processes."""
         logger.info(f"Starting {len(cameras)} camera(s)...")
+        self._preload_pipeline()
         for camera_id, config in cameras.items():
             self._start_camera(camera_id, config, show)
         logger.info("All cameras started. Monitoring...")
     
+    def _preload_pipeline(self):
+        """
+        Import the model stack once before forking.
+        
+        Forked cameras then share the imported modules copy-on-write instead of
+        each importing torch and ultralytics. Models are still loaded in the
+        children: CUDA must not be initialized before fork.
+        """
+        if self._mp_context.get_start_method() != "fork":
+            return
+        import src.services.pipeline  # noqa: F401
+    
     def _start_camera(self, camera_id: str, config: Dict, show: bool):
         """Start a single camera process."""
-        process = multiprocessing.Process(
+        process = self._mp_context.Process(
             target=self._camera_runner.run,
             args=(camera_id, config, show),
             name=f"Camera-{camera_id}",
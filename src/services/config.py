@@ -1,19 +1,81 @@
 from dataclasses import dataclass, field
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 from src.core.config import get_config
 
 
+# Field name -> key path in the config for every default filled from config.yaml
+_CONFIG_DEFAULTS = (
+    # Detection
+    ("det_model", ("detection", "model")),
+    ("imgsz", ("detection", "image_size")),
+    ("det_batch_size", ("detection", "batch_size")),
+    ("detect_stride", ("detection", "detect_stride")),
+    ("device", ("detection", "device")),
+    ("precision", ("detection", "precision")),
+    ("loader_prefetch", ("detection", "loader_prefetch")),
+    ("loader_num_threads", ("detection", "loader_num_threads")),
+    ("local_weight_cache_dir", ("detection", "local_weight_cache_dir")),
+    ("tensorrt", ("detection", "tensorrt")),
+    ("int8_calibration_data", ("detection", "int8_calibration_data")),
+    ("lazy_load", ("detection", "lazy_load")),
+    # Confidence thresholds
+    ("conf_threshold", ("confidence", "threshold")),
+    ("conf_person", ("confidence", "person")),
+    ("conf_train", ("confidence", "vehicle")),
+    # NMS
+    ("nms_iou", ("nms", "iou_threshold")),
+    # Tracker
+    ("tracker_iou_threshold", ("tracker", "iou_threshold")),
+    ("tracker_max_lost", ("tracker", "max_lost")),
+    ("tracker_use_prediction", ("tracker", "use_prediction")),
+    # Activity
+    ("activity_window", ("activity", "window")),
+    ("activity_person_speed_threshold", ("activity", "person", "speed_threshold")),
+    ("activity_vehicle_displacement_threshold", ("activity", "vehicle", "displacement_threshold")),
+    ("activity_vehicle_min_history", ("activity", "vehicle", "min_history")),
+)
+
+# (config the defaults were resolved from, resolved (field, value) pairs)
+_resolved_defaults: Optional[Tuple[Dict, Tuple[Tuple[str, Any], ...]]] = None
+
+
+def _get_defaults() -> Tuple[Tuple[str, Any], ...]:
+    """Resolve _CONFIG_DEFAULTS against the current config, once per loaded config."""
+    global _resolved_defaults
+    
+    config = get_config()
+    if _resolved_defaults is None or _resolved_defaults[0] is not config:
+        values = []
+        for name, path in _CONFIG_DEFAULTS:
+            value = config
+            for key in path:
+                value = value[key]
+            values.append((name, value))
+        _resolved_defaults = (config, tuple(values))
+    
+    return _resolved_defaults[1]
+
+
 @dataclass
 class PipelineConfig:
     """Pipeline configuration with automatic defaults from config.yaml."""
     source: Union[str, int] = 0
     output: Optional[str] = None
     device: Optional[str] = None
+    precision: Optional[str] = None
     det_model: Optional[str] = None
     imgsz: Optional[int] = None
+    det_batch_size: Optional[int] = None
+    detect_stride: Optional[int] = None
     conf_threshold: Optional[float] = None
     nms_iou: Optional[float] = None
+    loader_prefetch: Optional[str] = None
+    loader_num_threads: Optional[int] = None
+    local_weight_cache_dir: Optional[str] = None
+    tensorrt: Optional[bool] = None
+    int8_calibration_data: Optional[str] = None
+    lazy_load: Optional[bool] = None
     conf_person: Optional[float] = None
     conf_train: Optional[float] = None
     activity_window: Optional[int] = None
@@ -29,45 +91,9 @@ class PipelineConfig:
     activity_vehicle_min_history: Optional[int] = None
     
     def __post_init__(self):
-        config = get_config()
-        
-        # Detection
-        if self.det_model is None:
-            self.det_model = config["detection"]["model"]
-        if self.imgsz is None:
-            self.imgsz = config["detection"]["image_size"]
-        if self.device is None:
-            self.device = config["detection"]["device"]
-        
-        # Confidence thresholds
-        if self.conf_threshold is None:
-            self.conf_threshold = config["confidence"]["threshold"]
-        if self.conf_person is None:
-            self.conf_person = config["confidence"]["person"]
-        if self.conf_train is None:
-            self.conf_train = config["confidence"]["vehicle"]
-        
-        # NMS
-        if self.nms_iou is None:
-            self.nms_iou = config["nms"]["iou_threshold"]
-        
-        # Tracker
-        if self.tracker_iou_threshold is None:
-            self.tracker_iou_threshold = config["tracker"]["iou_threshold"]
-        if self.tracker_max_lost is None:
-            self.tracker_max_lost = config["tracker"]["max_lost"]
-        if self.tracker_use_prediction is None:
-            self.tracker_use_prediction = config["tracker"]["use_prediction"]
-        
-        # Activity
-        if self.activity_window is None:
-            self.activity_window = config["activity"]["window"]
-        if self.activity_person_speed_threshold is None:
-            self.activity_person_speed_threshold = config["activity"]["person"]["speed_threshold"]
-        if self.activity_vehicle_displacement_threshold is None:
-            self.activity_vehicle_displacement_threshold = config["activity"]["vehicle"]["displacement_threshold"]
-        if self.activity_vehicle_min_history is None:
-            self.activity_vehicle_min_history = config["activity"]["vehicle"]["min_history"]
+        for name, value in _get_defaults():
+            if getattr(self, name) is None:
+                setattr(self, name, value)
 
 
 PERSON_CLASSES = frozenset({"person"})
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import torch
+import functools
 import logging
 import os
 import shutil
+import threading
 
+from collections import Counter
 from pathlib import Path
 from ultralytics import YOLO # type: ignore
 from typing import Optional
 
+from src.services.weight_prefetch import prefetch_weights
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore
+
 try:
     from src.utils.weights_manager import MODEL_URLS, download_file  # type: ignore
 except ImportError:
@@ -27,8 +37,11 @@ MODEL_ALIASES = {
 
 DEFAULT_MODEL_DIR = Path("models")
 DEFAULT_ULTRALYTICS_WEIGHTS = Path.home() / ".ultralytics" / "weights"
+DEFAULT_WEIGHT_CACHE_MAX_BYTES = 20 * 1024 ** 3
+ENGINE_PRECISIONS = ("fp32", "fp16", "int8")
 
 
+@functools.cache
 def detect_device(requested: Optional[str] = None) -> str:
     """Detect available compute device (CUDA or CPU)."""
     if requested:
@@ -40,11 +53,18 @@ def detect_device(requested: Optional[str] = None) -> str:
     return "cuda" if torch.cuda.is_available() else "cpu"
 
 
+@functools.cache
+def _ensure_models_dir(models_dir: Path) -> Path:
+    """Create the models directory once per process and return its absolute path."""
+    models_dir = models_dir.absolute()
+    models_dir.mkdir(parents=True, exist_ok=True)
+    return models_dir
+
+
 class ModelPathResolver:
     """Resolves model paths from aliases and finds existing model files."""
     def __init__(self, models_dir: Path = DEFAULT_MODEL_DIR):
-        self.models_dir = models_dir.absolute()
-        self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.models_dir = _ensure_models_dir(models_dir)
     
     def normalize_name(self, model: str) -> str:
         """Convert model alias to canonical name."""
@@ -74,8 +94,7 @@ class ModelDownloader:
     """Downloads YOLO models from URLs if available."""
     
     def __init__(self, models_dir: Path = DEFAULT_MODEL_DIR):
-        self.models_dir = models_dir.absolute()
-        self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.models_dir = _ensure_models_dir(models_dir)
     
     def download(self, model_name: str) -> Optional[Path]:
         if model_name not in MODEL_URLS or download_file is None:
@@ -106,8 +125,7 @@ class ModelOrganizer:
     """Organizes models into central models directory."""
     
     def __init__(self, models_dir: Path = DEFAULT_MODEL_DIR):
-        self.models_dir = models_dir.absolute()
-        self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.models_dir = _ensure_models_dir(models_dir)
     
     def ensure_in_models_dir(self, model_path: str) -> str:
         path = Path(model_path).absolute()
@@ -164,38 +182,244 @@ class ModelOrganizer:
             return str(source)
 
 
+class LocalWeightCache:
+    """Copies weight files to a fast local directory, evicting least recently used files."""
+    
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_WEIGHT_CACHE_MAX_BYTES):
+        self.root = root.expanduser().resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+    
+    def get_or_fetch(self, source: Path) -> Path:
+        """Return the cached copy of source, copying it in first if missing or stale."""
+        cached = self.root / source.name
+        
+        try:
+            source_stat = source.stat()
+            if self._is_fresh(cached, source_stat):
+                os.utime(cached)
+                return cached
+            
+            self._evict(source_stat.st_size)
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            logger.info(f"Caching model {source} in {self.root}")
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, cached)
+            return cached
+        except OSError as e:
+            logger.warning(f"Local weight cache unavailable, loading {source} directly: {e}")
+            return source
+    
+    @staticmethod
+    def _is_fresh(cached: Path, source_stat: os.stat_result) -> bool:
+        try:
+            cached_stat = cached.stat()
+        except FileNotFoundError:
+            return False
+        return cached_stat.st_size == source_stat.st_size and cached_stat.st_mtime >= source_stat.st_mtime
+    
+    def _evict(self, incoming_bytes: int):
+        """Delete least recently used files until incoming_bytes fits under max_bytes."""
+        entries = [
+            (entry.stat(), entry) for entry in self.root.iterdir()
+            if entry.is_file() and entry.suffix != ".tmp"  # skip copies still in progress
+        ]
+        used = sum(entry_stat.st_size for entry_stat, _ in entries)
+        
+        for entry_stat, entry in sorted(entries, key=lambda item: item[0].st_atime):
+            if used + incoming_bytes <= self.max_bytes:
+                break
+            logger.info(f"Evicting cached model {entry}")
+            entry.unlink(missing_ok=True)
+            used -= entry_stat.st_size
+
+
+class TensorRTExporter:
+    """Exports PyTorch weights to a TensorRT engine cached next to them."""
+    
+    def __init__(
+        self,
+        imgsz: int = 640,
+        batch: int = 1,
+        precision: str = "fp16",
+        calibration_data: Optional[str] = None,
+        device: Optional[str] = "cuda"
+    ):
+        """
+        Initialize exporter.
+        
+        Args:
+            imgsz: Engine input size
+            batch: Maximum batch size the engine accepts
+            precision: "fp32", "fp16" or "int8"
+            calibration_data: Dataset YAML whose images calibrate INT8 ranges
+            device: CUDA device the engine is built for and later runs on ("cuda" or "cuda:N")
+        """
+        if precision not in ENGINE_PRECISIONS:
+            raise ValueError(f"Unsupported engine precision: {precision}")
+        self.imgsz = imgsz
+        self.batch = max(1, batch)
+        self.precision = precision
+        self.calibration_data = calibration_data
+        self.device_index = self._device_index(device)
+    
+    @staticmethod
+    def _device_index(device: Optional[str]) -> int:
+        """GPU index of a "cuda" / "cuda:N" device string."""
+        _, _, index = str(device or "").partition(":")
+        return int(index) if index.isdigit() else 0
+    
+    def engine_path(self, weights_path: Path) -> Path:
+        """Engine file for these weights and export settings."""
+        return weights_path.with_name(f"{weights_path.stem}-{self.precision}-{self.imgsz}-b{self.batch}.engine")
+    
+    def export(self, weights_path: Path) -> Path:
+        """Return the cached engine, exporting it first if needed."""
+        engine_path = self.engine_path(weights_path)
+        if engine_path.is_file():
+            return engine_path
+        
+        # Cameras starting together must not build the same engine twice
+        lock_path = weights_path.with_suffix(".engine.lock")
+        with open(lock_path, "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if not engine_path.is_file():
+                    self._export(weights_path, engine_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        
+        return engine_path
+    
+    def _export(self, weights_path: Path, engine_path: Path):
+        logger.info(f"Exporting {weights_path} to TensorRT engine {engine_path}")
+        exported = YOLO(str(weights_path)).export(
+            format="engine",
+            half=self.precision == "fp16",
+            int8=self.precision == "int8",
+            data=self.calibration_data if self.precision == "int8" else None,
+            imgsz=self.imgsz,
+            batch=self.batch,
+            dynamic=self.batch > 1,
+            device=self.device_index,
+            verbose=False
+        )
+        shutil.move(str(exported), engine_path)
+
+
 class UltralyticsEnvironment:
-    """Context manager for setting ULTRALYTICS_HOME environment variable."""
+    """
+    Context manager for setting ULTRALYTICS_HOME environment variable.
+    
+    Leaves the environment untouched when it already points at models_dir
+    (see configure_model_environment), so loads on background threads do not
+    write the environment while other threads read it.
+    """
     
     def __init__(self, models_dir: Path):
         self.models_dir = models_dir.absolute()
         self.old_home: Optional[str] = None
+        self._changed = False
     
     def __enter__(self):
         self.old_home = os.environ.get("ULTRALYTICS_HOME")
-        os.environ["ULTRALYTICS_HOME"] = str(self.models_dir)
+        self._changed = self.old_home != str(self.models_dir)
+        if self._changed:
+            os.environ["ULTRALYTICS_HOME"] = str(self.models_dir)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._changed:
+            return
         if self.old_home is not None:
             os.environ["ULTRALYTICS_HOME"] = self.old_home
         elif "ULTRALYTICS_HOME" in os.environ:
             del os.environ["ULTRALYTICS_HOME"]
 
 
+class MmapTorchLoad:
+    """
+    Context manager that makes torch.load memory-map checkpoints instead of reading them whole.
+    
+    torch.load is patched once while any instance is active (refcounted under a
+    lock), and only calls from threads inside the context are memory-mapped.
+    """
+    
+    _lock = threading.Lock()
+    _original = None
+    _threads: Counter = Counter()
+    
+    def __enter__(self):
+        cls = MmapTorchLoad
+        with cls._lock:
+            if not cls._threads:
+                cls._original = torch.load
+                torch.load = cls._load
+            cls._threads[threading.get_ident()] += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        cls = MmapTorchLoad
+        with cls._lock:
+            ident = threading.get_ident()
+            cls._threads[ident] -= 1
+            if cls._threads[ident] <= 0:
+                del cls._threads[ident]
+            if not cls._threads:
+                torch.load = cls._original
+                cls._original = None
+    
+    @staticmethod
+    def _load(*args, **kwargs):
+        original = MmapTorchLoad._original
+        if threading.get_ident() not in MmapTorchLoad._threads:
+            return original(*args, **kwargs)
+        
+        kwargs.setdefault("map_location", "cpu")
+        try:
+            return original(*args, mmap=True, **kwargs)
+        except (TypeError, ValueError, RuntimeError) as e:
+            # Only retry when mmap itself is unsupported: older torch, legacy
+            # (non-zip) checkpoints or file objects. Other errors surface as is.
+            if "mmap" not in str(e):
+                raise
+            logger.debug(f"mmap load failed, falling back to a full read: {e}")
+            return original(*args, **kwargs)
+
+
 def _move_model_to_device(yolo_model, device: Optional[str]) -> None:
     if not device or torch is None:
         return
     
     try:
         if hasattr(yolo_model, "model") and yolo_model.model is not None:
-            yolo_model.model.to(torch.device(device))
+            yolo_model.model.to(torch.device(device), non_blocking=True)
     except Exception as e:
         logger.debug(f"Failed to move model to device {device}: {e}")
 
 
-def load_model(model: str = "yolo11m", device: Optional[str] = None):
-    """Load YOLO model with path resolution, downloading, and device setup."""
+def load_model(
+    model: str = "yolo11m",
+    device: Optional[str] = None,
+    prefetch: Optional[str] = "threads",
+    num_threads: int = 8,
+    cache_dir: Optional[str] = None,
+    tensorrt: bool = False,
+    imgsz: int = 640,
+    batch: int = 1,
+    precision: str = "fp16",
+    calibration_data: Optional[str] = None
+):
+    """
+    Load YOLO model with path resolution, downloading, and device setup.
+    
+    With tensorrt set on a CUDA device, .pt weights are exported once to a
+    TensorRT engine (sized for imgsz and batch, in the given precision) and
+    the engine is loaded instead; export failures fall back to the PyTorch
+    weights. INT8 engines are calibrated on the calibration_data dataset.
+    """
     resolver = ModelPathResolver()
     downloader = ModelDownloader()
     organizer = ModelOrganizer()
@@ -206,14 +430,39 @@ def load_model(model: str = "yolo11m", device: Optional[str] = None):
     if downloaded_path:
         resolved_path = str(downloaded_path)
     
-    logger.info(f"Loading model: {resolved_path}")
-    
     if YOLO is None:
         raise RuntimeError("ultralytics package is not installed")
     
+    load_path = resolved_path
+    if tensorrt and str(device).startswith("cuda") and load_path.endswith(".pt"):
+        exporter = TensorRTExporter(
+            imgsz=imgsz,
+            batch=batch,
+            precision=precision,
+            calibration_data=calibration_data,
+            device=device
+        )
+        # Engines are built next to the source weights, outside the weight
+        # cache, whose eviction would otherwise force a rebuild
+        try:
+            load_path = str(exporter.export(Path(load_path)))
+        except Exception as e:
+            logger.warning(f"TensorRT export failed, using PyTorch weights: {e}")
+    elif precision == "int8":
+        logger.warning("INT8 precision needs tensorrt on a CUDA device; running PyTorch weights")
+    
+    cache_dir = cache_dir or os.environ.get("LOCAL_WEIGHTS_CACHE")
+    if cache_dir and Path(load_path).is_file():
+        load_path = str(LocalWeightCache(Path(cache_dir)).get_or_fetch(Path(load_path)))
+    
+    logger.info(f"Loading model: {load_path}")
+    
+    # Warm the page cache so the single-threaded torch.load reads from memory
+    prefetch_weights(load_path, method=prefetch, num_threads=num_threads)
+    
     try:
-        with UltralyticsEnvironment(organizer.models_dir):
-            yolo_model = YOLO(resolved_path)
+        with UltralyticsEnvironment(organizer.models_dir), MmapTorchLoad():
+            yolo_model = YOLO(load_path)
         
         organized_path = organizer.ensure_in_models_dir(resolved_path)
         if organized_path != resolved_path:
@@ -226,10 +475,21 @@ def load_model(model: str = "yolo11m", device: Optional[str] = None):
         raise RuntimeError(f"Failed to load model '{model}': {e}") from e
 
 
+def configure_model_environment(models_dir: Path = DEFAULT_MODEL_DIR):
+    """
+    Point ULTRALYTICS_HOME at the models directory for the whole process.
+    
+    Call from the main thread before load_model runs in the background:
+    setenv is not thread-safe against concurrent getenv (e.g. FFmpeg opening
+    a capture), and load_model then leaves the environment alone.
+    """
+    os.environ["ULTRALYTICS_HOME"] = str(ModelOrganizer(models_dir).models_dir)
+
+
 def resolve_model_path(model: str) -> str:
     """Resolve model name/alias to file path."""
     resolver = ModelPathResolver()
     return resolver.resolve(model)
 
 
-__all__ = ["detect_device", "resolve_model_path", "load_model"]
+__all__ = ["detect_device", "resolve_model_path", "load_model", "configure_model_environment"]
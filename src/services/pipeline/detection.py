@@ -1,12 +1,13 @@
 import logging
-import queue
 import threading
-from typing import List, Optional
+from collections import deque
+from typing import Deque, List, Optional
 
 import numpy as np
 
 from src.services.config import PipelineConfig
 from src.services.tracker import Tracker, Track
+from src.services.track import TrackView
 from src.services.pipeline.frame_detection import FrameDetector
 from src.services.pipeline.track_processing import TrackProcessor
 from src.services.activity import ActivityClassifier
@@ -28,8 +29,15 @@ class DetectionWorker:
         self._frame_detector = FrameDetector(det_model, config)
         self._track_processor = TrackProcessor(det_model, classifier, camera_id=camera_id)
         
-        self._queue: queue.Queue = queue.Queue(maxsize=1)
-        self._tracks: List[Track] = []
+        # Reusable frame buffers, twice the batch size: the worker may read one
+        # batch while the next one fills, so submit never allocates
+        self._batch_size = max(1, config.det_batch_size or 1)
+        self._slots: List[Optional[np.ndarray]] = [None] * (2 * self._batch_size)
+        self._free_slots: List[int] = list(range(len(self._slots)))
+        self._ready_slots: Deque[int] = deque()
+        self._busy_slots: List[int] = []
+        self._slot_cond = threading.Condition()
+        self._tracks: List[TrackView] = []
         self._lock = threading.Lock()
         self._running = False
         self._thread: Optional[threading.Thread] = None
@@ -40,62 +48,96 @@ class DetectionWorker:
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
     
+    def warmup(self) -> bool:
+        """Run a first prediction before frames arrive."""
+        return self._frame_detector.warmup()
+    
     def stop(self):
-        """Stop worker thread."""
+        """Stop worker thread; the thread closes the track processor once it exits."""
         self._running = False
-        if self._thread:
-            self._thread.join(timeout=2.0)
+        if not self._thread:
+            self._track_processor.close()
+            return
+        
+        self._thread.join(timeout=2.0)
+        if self._thread.is_alive():
+            logger.warning("Detection worker still busy; activity logs are flushed when it finishes")
     
     def submit(self, frame: np.ndarray):
-        """Submit frame for processing."""
-        try:
-            self._queue.put_nowait(frame.copy())
-        except queue.Full:
-            self._drop_old_frame(frame)
-    
-    def _drop_old_frame(self, frame: np.ndarray):
-        """Drop oldest frame and add new one."""
-        try:
-            self._queue.get_nowait()
-            self._queue.put_nowait(frame.copy())
-        except Exception:
-            pass
+        """Submit frame for processing, dropping the oldest waiting frame if all buffers are taken."""
+        with self._slot_cond:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                slot = self._ready_slots.popleft()
+        
+        dst = self._slots[slot]
+        if dst is None or dst.shape != frame.shape or dst.dtype != frame.dtype:
+            dst = self._slots[slot] = np.empty_like(frame)
+        np.copyto(dst, frame)
+        
+        with self._slot_cond:
+            self._ready_slots.append(slot)
+            self._slot_cond.notify()
     
-    def get_tracks(self) -> List[Track]:
-        """Get current tracks (thread-safe)."""
+    def get_tracks(self) -> List[TrackView]:
+        """Get snapshots of the current tracks (thread-safe)."""
         with self._lock:
             return list(self._tracks)
     
     def _loop(self):
         """Main processing loop."""
-        while self._running:
-            frame = self._get_frame()
-            if frame is None:
-                continue
-            
-            tracks = self._process_frame(frame)
-            self._update_tracks(tracks)
-    
-    def _get_frame(self) -> Optional[np.ndarray]:
-        """Get frame from queue."""
         try:
-            return self._queue.get(timeout=0.01)
-        except queue.Empty:
-            return None
+            while self._running:
+                frames = self._get_frames()
+                if not frames:
+                    continue
+                
+                try:
+                    tracks = self._process_frames(frames)
+                except Exception as e:
+                    logger.warning(f"Detection failed: {e}")
+                    continue
+                finally:
+                    self._release_frames()
+                self._update_tracks(tracks)
+        finally:
+            # Closed here rather than in stop, which may time out while a
+            # batch is still being processed and logged
+            self._track_processor.close()
     
-    def _process_frame(self, frame: np.ndarray) -> List[Track]:
-        """Process single frame through detection pipeline."""
-        detections = self._frame_detector.detect(frame)
-        detections = self._frame_detector.filter(detections)
-        
-        self._tracker.update(detections)
-        tracks = list(self._tracker.tracks.values())
-        
-        self._track_processor.process(tracks)
+    def _get_frames(self) -> List[np.ndarray]:
+        """Take up to batch_size waiting frames in submit order, waiting briefly if there are none."""
+        with self._slot_cond:
+            if not self._ready_slots:
+                self._slot_cond.wait(timeout=0.01)
+            while self._ready_slots and len(self._busy_slots) < self._batch_size:
+                self._busy_slots.append(self._ready_slots.popleft())
+            return [self._slots[slot] for slot in self._busy_slots]
+    
+    def _release_frames(self):
+        """Hand the slots just processed back to submit."""
+        with self._slot_cond:
+            self._free_slots.extend(self._busy_slots)
+            self._busy_slots.clear()
+    
+    def _process_frames(self, frames: List[np.ndarray]) -> List[Track]:
+        """Detect a batch of frames at once, then track them one by one in order."""
+        tracks: List[Track] = []
+        for detections in self._frame_detector.detect_batch(frames):
+            self._tracker.update(detections)
+            tracks = list(self._tracker.tracks.values())
+            
+            self._track_processor.process(tracks)
         
         return tracks
     
     def _update_tracks(self, tracks: List[Track]):
-        """Update tracks (thread-safe)."""
+        """Publish snapshots of tracks (thread-safe).
+        
+        Snapshots are taken here on the worker thread, since the tracker mutates
+        the live tracks (and their history) while other threads draw them.
+        """
+        snapshots = [track.snapshot() for track in tracks]
         with self._lock:
-            self._tracks = tracks
+            self._tracks = snapshots
@@ -1,3 +1,4 @@
+import functools
 import logging
 from typing import Optional
 import torch
@@ -5,6 +6,7 @@ import torch
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
 def detect_device(requested: Optional[str] = None) -> str:
     if requested:
         return requested
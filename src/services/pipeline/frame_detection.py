@@ -1,5 +1,5 @@
 import logging
-from typing import List, Tuple, Optional
+from typing import List, Optional
 
 import numpy as np
 
@@ -9,70 +9,109 @@ from src.services.pipeline.utils import get_class_name
 logger = logging.getLogger(__name__)
 
 
+# Detections are (N, 6) float arrays of x1, y1, x2, y2, cls, score
+DETECTION_COLUMNS = 6
+# Reorders Ultralytics boxes.data (x1, y1, x2, y2, conf, cls) into detection columns
+_BOXES_DATA_ORDER = [0, 1, 2, 3, 5, 4]
+
+
+def _empty_detections() -> np.ndarray:
+    return np.empty((0, DETECTION_COLUMNS), dtype=np.float32)
+
+
 class FrameDetector:
     
     def __init__(self, det_model, config: PipelineConfig):
         self._det_model = det_model
         self._config = config
+        self._half = self._use_half(config)
+        self._threshold_lut = self._build_threshold_lut()
+        # Threshold table copies on each device results come back on
+        self._device_threshold_luts = {}
     
-    def detect(self, frame: np.ndarray) -> List[Tuple]:
-        """Run object detection on frame."""
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        """Run object detection on frame, keeping detections that pass the class thresholds."""
+        return self.detect_batch([frame])[0]
+    
+    def detect_batch(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Run object detection on several frames in one predict call, one filtered result per frame."""
         if self._det_model is None:
-            return []
+            return [_empty_detections() for _ in frames]
+        
+        results = self._det_model.predict(
+            source=frames if len(frames) > 1 else frames[0],
+            imgsz=self._config.imgsz,
+            conf=self._config.conf_threshold,
+            iou=self._config.nms_iou,
+            save=False,
+            verbose=False,
+            device=self._config.device,
+            half=self._half
+        )
+        return [self._parse_result(r) for r in results]
+    
+    def warmup(self) -> bool:
+        """
+        Run one prediction on a blank frame.
         
+        Pays one-off CUDA/engine initialization before the first real frame
+        and surfaces model or config errors at startup.
+        
+        Returns:
+            True if the model predicted successfully (or there is no model)
+        """
+        imgsz = self._config.imgsz or 640
         try:
-            results = self._det_model.predict(
-                source=frame,
-                imgsz=self._config.imgsz,
-                conf=self._config.conf_threshold,
-                iou=self._config.nms_iou,
-                save=False,
-                verbose=False,
-                device=self._config.device
-            )
+            self.detect(np.zeros((imgsz, imgsz, 3), dtype=np.uint8))
+            return True
         except Exception as e:
-            logger.warning(f"Detection failed: {e}")
-            return []
-        
-        return self._extract_detections(results)
+            logger.error(f"Detection warmup failed: {e}")
+            return False
     
-    def _extract_detections(self, results) -> List[Tuple]:
-        """Extract detections from YOLO results."""
-        detections = []
-        for r in results:
-            detections.extend(self._parse_result(r))
-        return detections
+    @staticmethod
+    def _use_half(config: PipelineConfig) -> bool:
+        """FP16 inference only pays off (and is only supported) on CUDA."""
+        return config.precision == "fp16" and str(config.device).startswith("cuda")
     
-    def _parse_result(self, result) -> List[Tuple]:
-        """Parse single YOLO result."""
+    def _parse_result(self, result) -> np.ndarray:
+        """Parse single YOLO result, dropping detections below their class threshold on the device."""
         try:
-            boxes = result.boxes.xyxy.cpu().numpy()
-            confs = result.boxes.conf.cpu().numpy()
-            classes = result.boxes.cls.cpu().numpy().astype(int)
-            
-            return [
-                (*map(float, box[:4]), int(cls_id), float(score))
-                for box, cls_id, score in zip(boxes, classes, confs)
-            ]
+            # boxes.data already holds every box as one tensor on the device,
+            # so a single transfer of the kept rows replaces separate
+            # xyxy/conf/cls copies
+            data = result.boxes.data[:, :6].float()
+            lut = self._device_threshold_lut(data)
+            cls_ids = data[:, 5].long().clamp_(0, len(lut) - 1)
+            data = data[data[:, 4] >= lut[cls_ids]]
+            return data.cpu().numpy()[:, _BOXES_DATA_ORDER]
         except Exception:
-            return []
+            return _empty_detections()
     
-    def filter(self, detections: List[Tuple]) -> List[Tuple]:
-        """Filter detections by class-specific confidence thresholds."""
-        names = getattr(self._det_model, 'names', None)
-        result = []
+    def _device_threshold_lut(self, data):
+        """Threshold table as a tensor with the same device and dtype as data."""
+        lut = self._device_threshold_luts.get(data.device)
+        if lut is None:
+            lut = data.new_tensor(self._threshold_lut)
+            self._device_threshold_luts[data.device] = lut
+        return lut
+    
+    def _build_threshold_lut(self) -> np.ndarray:
+        """
+        Build a per-class-id confidence threshold table from the model's class names.
         
-        for det in detections:
-            cls_name = get_class_name(names, det[4])
-            threshold = self._get_threshold(cls_name)
-            
-            if threshold is None:
-                continue
-            
-            if det[5] >= threshold:
-                result.append(det)
+        Classes without a threshold get +inf so they never pass the filter.
+        """
+        names = getattr(self._det_model, 'names', None)
+        if not names:
+            return np.full(1, np.inf, dtype=np.float32)
         
-        return result
+        class_ids = names.keys() if isinstance(names, dict) else range(len(names))
+        lut = np.full(max(class_ids) + 2, np.inf, dtype=np.float32)
+        for cls_id in class_ids:
+            threshold = self._get_threshold(get_class_name(names, cls_id))
+            if threshold is not None:
+                lut[cls_id] = threshold
+        return lut
     
     def _get_threshold(self, cls_name: Optional[str]) -> Optional[float]:
         """Get confidence threshold for class."""
@@ -81,4 +120,3 @@ class FrameDetector:
         if cls_name in VEHICLE_CLASSES:
             return self._config.conf_train
         return None
-
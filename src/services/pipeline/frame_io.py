@@ -0,0 +1,141 @@
+import logging
+import queue
+import threading
+from typing import Callable, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.services.track import TrackView
+from src.utils.constants import FRAME_QUEUE_SIZE
+from src.utils.visualizer import draw_tracks
+
+logger = logging.getLogger(__name__)
+
+
+class FrameReader:
+    """Decodes and resizes frames on a background thread, ahead of the consumer."""
+    
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        resize: Optional[Tuple[int, int]],
+        queue_size: int = FRAME_QUEUE_SIZE
+    ):
+        self._cap = cap
+        self._resize = tuple(resize) if resize else None
+        self._frames: queue.Queue = queue.Queue(maxsize=queue_size)
+        # Buffers handed back by the consumer, reused for later frames
+        self._free: queue.SimpleQueue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start reader thread."""
+        self._thread = threading.Thread(target=self._loop, name="frame-reader", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop reader thread, waiting briefly for it to exit."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+    
+    def is_alive(self) -> bool:
+        """Whether the reader thread is still running, e.g. blocked reading a stalled stream."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def get(self) -> Optional[np.ndarray]:
+        """Get next frame, or None once the source is exhausted."""
+        return self._frames.get()
+    
+    def recycle(self, frame: np.ndarray):
+        """Return a frame buffer the consumer is done with."""
+        self._free.put(frame)
+    
+    def _loop(self):
+        read_buf: Optional[np.ndarray] = None
+        try:
+            while not self._stop.is_set():
+                ret, read_buf = self._cap.read(read_buf)
+                if not ret:
+                    break
+                
+                frame = self._take_free()
+                if self._resize and read_buf.shape[1::-1] != self._resize:
+                    frame = cv2.resize(read_buf, self._resize, dst=frame)
+                else:
+                    # Hand the decoded buffer over and decode the next frame into the free one
+                    frame, read_buf = read_buf, frame
+                
+                if not self._put(frame):
+                    break
+        except Exception as e:
+            logger.error(f"Frame reader failed: {e}")
+        finally:
+            self._put(None)
+    
+    def _take_free(self) -> Optional[np.ndarray]:
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def _put(self, frame: Optional[np.ndarray]) -> bool:
+        """Queue frame, giving up if the reader is stopped while the queue is full."""
+        while True:
+            try:
+                self._frames.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
+
+
+class FrameWriter:
+    """Encodes frames on a background thread so video writing overlaps processing."""
+    
+    def __init__(
+        self,
+        writer: cv2.VideoWriter,
+        on_written: Callable[[np.ndarray], None],
+        queue_size: int = FRAME_QUEUE_SIZE
+    ):
+        self._writer = writer
+        self._on_written = on_written
+        self._frames: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start writer thread."""
+        self._thread = threading.Thread(target=self._loop, name="frame-writer", daemon=True)
+        self._thread.start()
+    
+    def put(self, frame: np.ndarray, tracks: Optional[Sequence[TrackView]] = None):
+        """Queue frame for writing, blocking while the writer is behind; tracks are drawn on it first if given.
+        
+        Tracks are drawn up to queue_size frames later, so they must be snapshots
+        taken for this frame (as returned by DetectionWorker.get_tracks), not live tracks.
+        """
+        self._frames.put((frame, tuple(tracks) if tracks is not None else None))
+    
+    def close(self):
+        """Write remaining frames and stop writer thread."""
+        self._frames.put(None)
+        if self._thread:
+            self._thread.join()
+    
+    def _loop(self):
+        while True:
+            item = self._frames.get()
+            if item is None:
+                break
+            
+            frame, tracks = item
+            try:
+                if tracks is not None:
+                    draw_tracks(frame, tracks)
+                self._writer.write(frame)
+            except Exception as e:
+                logger.warning(f"Failed to write frame: {e}")
+            self._on_written(frame)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -9,9 +12,10 @@ import cv2
 import numpy as np
 
 from src.services.config import PipelineConfig
-from src.services.detector import load_model
+from src.services.detector import configure_model_environment, load_model
 from src.services.tracker import Tracker
 from src.services.pipeline.detection import DetectionWorker
+from src.services.pipeline.frame_io import FrameReader, FrameWriter
 from src.services.pipeline.device import detect_device
 from src.utils.visualizer import draw_tracks
 from src.services.activity import ActivityClassifier
@@ -26,6 +30,8 @@ from src.utils.constants import (
     DEFAULT_VEHICLE_MIN_HISTORY,
     WINDOW_NAME,
     QUIT_KEYS,
+    STREAM_PREFIXES,
+    CLOCK_POLL_FRAMES,
 )
 from src.utils.state_sync import (
     register_camera_start,
@@ -36,6 +42,11 @@ from src.core.config import get_config
 
 logger = logging.getLogger(__name__)
 
+_NS_PER_SECOND = 1_000_000_000
+_HEARTBEAT_INTERVAL_NS = int(HEARTBEAT_INTERVAL * _NS_PER_SECOND)
+_LOG_INTERVAL_NS = int(LOG_INTERVAL * _NS_PER_SECOND)
+_CLOCK_POLL_MASK = CLOCK_POLL_FRAMES - 1
+
 
 class Pipeline:
     
@@ -43,10 +54,15 @@ class Pipeline:
         self._config = config
         self._config.device = detect_device(config.device)
         self._camera_id = camera_id
+        self._detect_stride = max(1, config.detect_stride or 1)
         
         self._log_init_info()
         
-        self._det_model = self._load_model(config.det_model)
+        self._det_model = None
+        self._model_future: Optional[Future] = None
+        self._model_lock = threading.Lock()
+        if not config.lazy_load:
+            self.preload()
         self._tracker = self._create_tracker(config)
         self._classifier: Optional[ActivityClassifier] = None
     
@@ -57,13 +73,40 @@ class Pipeline:
         if self._camera_id:
             logger.info(f"Camera ID: {self._camera_id}")
     
+    def preload(self) -> Future:
+        """Start loading the detection model if it is not loading already."""
+        with self._model_lock:
+            if self._model_future is None:
+                self._model_future = self._start_model_load(self._config.det_model)
+            return self._model_future
+    
+    def _start_model_load(self, model_name: Optional[str]) -> Future:
+        """Load the detection model in the background so it overlaps with video setup."""
+        # Environment writes happen here, before the main thread opens captures
+        configure_model_environment()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-load")
+        future = executor.submit(self._load_model, model_name)
+        executor.shutdown(wait=False)
+        return future
+    
     def _load_model(self, model_name: Optional[str]):
         """Load detection model."""
         if not model_name:
             return None
         
         try:
-            return load_model(model_name, device=self._config.device)
+            return load_model(
+                model_name,
+                device=self._config.device,
+                prefetch=self._config.loader_prefetch,
+                num_threads=self._config.loader_num_threads,
+                cache_dir=self._config.local_weight_cache_dir,
+                tensorrt=bool(self._config.tensorrt),
+                imgsz=self._config.imgsz,
+                batch=self._config.det_batch_size or 1,
+                precision=self._config.precision,
+                calibration_data=self._config.int8_calibration_data
+            )
         except Exception as e:
             logger.error(f"Failed to load {model_name}: {e}")
             return None
@@ -88,21 +131,29 @@ class Pipeline:
     ):
         """Run pipeline on video source."""
         self._register_camera_start()
+        model_future = self.preload()
         
         cap = self._open_video()
         fps, resize = self._get_video_params(cap, resize)
         
-        self._classifier = self._create_classifier(fps)
-        worker = self._create_worker()
-        worker.start()
-        
+        # Track histories advance once per detected frame, not per video frame
+        self._classifier = self._create_classifier(fps / self._detect_stride)
         writer = self._create_writer(fps, resize)
         
+        # Video capture and writer setup ran while the model was loading
+        self._det_model = model_future.result()
+        worker = self._create_worker()
+        reader = FrameReader(cap, resize)
+        
         try:
-            self._process(cap, worker, writer, resize, show, max_frames)
+            # A model that cannot predict would only log failures per frame
+            if not worker.warmup():
+                raise RuntimeError("Detection warmup failed; not starting camera")
+            worker.start()
+            self._process(reader, worker, writer, show, max_frames)
         finally:
             self._register_camera_stop()
-            self._cleanup(cap, worker, writer, show)
+            self._cleanup(cap, reader, worker, writer, show)
     
     def _create_worker(self) -> DetectionWorker:
         """Create detection worker."""
@@ -135,10 +186,34 @@ class Pipeline:
             logger.warning(f"Failed to register camera stop: {e}")
     
     def _open_video(self) -> cv2.VideoCapture:
-        """Open video source."""
-        cap = cv2.VideoCapture(self._config.source)
+        """Open video source, preferring FFmpeg hardware decoding for file and stream paths."""
+        source = self._config.source
+        cap = self._open_hw_capture(source) if isinstance(source, str) else None
+        if cap is None:
+            cap = cv2.VideoCapture(source)
         if not cap.isOpened():
-            raise RuntimeError(f"Cannot open: {self._config.source}")
+            raise RuntimeError(f"Cannot open: {source}")
+        
+        # Keep live streams at the newest frame instead of a backlog
+        if isinstance(source, str) and source.lower().startswith(STREAM_PREFIXES):
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    
+    def _open_hw_capture(self, source: str) -> Optional[cv2.VideoCapture]:
+        """Open source through FFmpeg with any available hardware decoder, or None if that fails."""
+        hw_acceleration = getattr(cv2, "CAP_PROP_HW_ACCELERATION", None)
+        if hw_acceleration is None:
+            return None
+        
+        try:
+            cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, [hw_acceleration, cv2.VIDEO_ACCELERATION_ANY])
+        except cv2.error as e:
+            logger.debug(f"Hardware-accelerated capture unavailable: {e}")
+            return None
+        
+        if not cap.isOpened():
+            cap.release()
+            return None
         return cap
     
     def _get_video_params(self, cap: cv2.VideoCapture, resize: Optional[Tuple[int, int]]) -> Tuple[float, Tuple[int, int]]:
@@ -169,6 +244,11 @@ class Pipeline:
             return None
         
         Path(self._config.output).parent.mkdir(parents=True, exist_ok=True)
+        if str(self._config.device).startswith("cuda"):
+            writer = self._create_nvenc_writer(fps, size)
+            if writer is not None:
+                return writer
+        
         return cv2.VideoWriter(
             self._config.output,
             cv2.VideoWriter.fourcc(*"mp4v"),
@@ -176,73 +256,116 @@ class Pipeline:
             size
         )
     
+    def _create_nvenc_writer(self, fps: float, size: Tuple[int, int]) -> Optional[cv2.VideoWriter]:
+        """Open a GStreamer H.264 NVENC writer, or None if OpenCV or GStreamer cannot provide one."""
+        pipeline = (
+            "appsrc ! videoconvert ! nvh264enc ! h264parse ! mp4mux ! "
+            f"filesink location=\"{self._config.output}\""
+        )
+        try:
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, size)
+        except cv2.error as e:
+            logger.debug(f"NVENC writer unavailable: {e}")
+            return None
+        
+        if not writer.isOpened():
+            writer.release()
+            return None
+        
+        logger.info("Encoding output with NVENC")
+        return writer
+    
     def _process(
         self,
-        cap: cv2.VideoCapture,
+        reader: FrameReader,
         worker: DetectionWorker,
         writer: Optional[cv2.VideoWriter],
-        resize: Tuple[int, int],
         show: bool,
         max_frames: Optional[int]
     ):
         """Main processing loop."""
         frame_count = 0
-        start = time.time()
+        # Monotonic nanoseconds; intervals are seconds long, so the clock is
+        # only read every CLOCK_POLL_FRAMES frames
+        start = time.monotonic_ns()
         last_log_time = start
         last_heartbeat_time = start
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            frame_count += 1
-            frame = self._resize_frame(frame, resize)
-            
-            tracks = self._process_frame(worker, frame)
-            self._write_frame(writer, frame)
-            
-            if self._should_quit(show, frame):
-                break
-            
-            current_time = time.time()
-            last_heartbeat_time = self._update_heartbeat(current_time, last_heartbeat_time)
-            last_log_time = self._update_logging(frame_count, tracks, current_time, start, last_log_time)
-            
-            if self._should_stop(frame_count, max_frames):
-                break
+        # Decoding and encoding run on their own threads; detection results are
+        # still consumed here so tracker and classifier state stay single-threaded
+        reader.start()
+        frame_writer = self._create_frame_writer(writer, reader)
+        
+        try:
+            while True:
+                frame = reader.get()
+                if frame is None:
+                    break
+                
+                frame_count += 1
+                # Shown frames are drawn here; frames only written are drawn on
+                # the writer thread from this frame's track snapshots, and frames
+                # nobody sees are not drawn at all
+                tracks = self._process_frame(worker, frame, frame_count, draw=show)
+                should_quit = self._should_quit(show, frame)
+                # The frame buffer goes back to the reader once it is written
+                if frame_writer:
+                    frame_writer.put(frame, None if show else tracks)
+                else:
+                    reader.recycle(frame)
+                
+                if should_quit:
+                    break
+                
+                if frame_count & _CLOCK_POLL_MASK == 0:
+                    current_time = time.monotonic_ns()
+                    last_heartbeat_time = self._update_heartbeat(current_time, last_heartbeat_time)
+                    last_log_time = self._update_logging(frame_count, tracks, current_time, start, last_log_time)
+                
+                if self._should_stop(frame_count, max_frames):
+                    break
+        finally:
+            reader.stop()
+            if frame_writer:
+                frame_writer.close()
         
         self._log_final_stats(frame_count, start)
     
-    def _process_frame(self, worker: DetectionWorker, frame: np.ndarray) -> List:
-        """Process frame through detection worker."""
-        worker.submit(frame)
+    def _create_frame_writer(self, writer: Optional[cv2.VideoWriter], reader: FrameReader) -> Optional[FrameWriter]:
+        """Start background frame writer if output is enabled."""
+        if not writer:
+            return None
+        
+        frame_writer = FrameWriter(writer, reader.recycle)
+        frame_writer.start()
+        return frame_writer
+    
+    def _process_frame(self, worker: DetectionWorker, frame: np.ndarray, frame_count: int, draw: bool = True) -> List:
+        """Submit every detect_stride-th frame to the detection worker and get the latest tracks, drawn if asked."""
+        if (frame_count - 1) % self._detect_stride == 0:
+            worker.submit(frame)
         tracks = worker.get_tracks()
-        draw_tracks(frame, tracks)
+        if draw:
+            draw_tracks(frame, tracks)
         return tracks
     
-    def _write_frame(self, writer: Optional[cv2.VideoWriter], frame: np.ndarray):
-        """Write frame to video writer if available."""
-        if writer:
-            writer.write(frame)
-    
     def _should_quit(self, show: bool, frame: np.ndarray) -> bool:
         """Check if processing should quit."""
         if not show:
             return False
         return self._handle_show_window(frame)
     
-    def _update_heartbeat(self, current_time: float, last_heartbeat_time: float) -> float:
-        """Update heartbeat if needed."""
-        if current_time - last_heartbeat_time < HEARTBEAT_INTERVAL:
+    def _update_heartbeat(self, current_time: int, last_heartbeat_time: int) -> int:
+        """Update heartbeat if needed (times in monotonic ns)."""
+        if current_time - last_heartbeat_time < _HEARTBEAT_INTERVAL_NS:
             return last_heartbeat_time
         
         self._send_heartbeat_if_needed()
         return current_time
     
-    def _update_logging(self, frame_count: int, tracks: List, current_time: float, start: float, last_log_time: float) -> float:
-        """Update logging if needed."""
-        if current_time - last_log_time < LOG_INTERVAL:
+    def _update_logging(self, frame_count: int, tracks: List, current_time: int, start: int, last_log_time: int) -> int:
+        """Update logging if needed (times in monotonic ns)."""
+        if current_time - last_log_time < _LOG_INTERVAL_NS:
             return last_log_time
         
         self._log_progress(frame_count, tracks, current_time, start)
@@ -254,9 +377,9 @@ class Pipeline:
             return False
         return frame_count >= max_frames
     
-    def _log_final_stats(self, frame_count: int, start: float):
+    def _log_final_stats(self, frame_count: int, start: int):
         """Log final processing statistics."""
-        elapsed = time.time() - start
+        elapsed = (time.monotonic_ns() - start) / _NS_PER_SECOND
         camera_info = self._format_camera_info()
         fps = frame_count / elapsed if elapsed > 0 else 0
         
@@ -271,12 +394,6 @@ class Pipeline:
             return ""
         return f" [{self._camera_id}]"
     
-    def _resize_frame(self, frame: np.ndarray, resize: Optional[Tuple[int, int]]) -> np.ndarray:
-        """Resize frame if needed."""
-        if resize:
-            return cv2.resize(frame, resize)
-        return frame
-    
     def _send_heartbeat_if_needed(self):
         """Send heartbeat to keep camera active."""
         if not self._camera_id:
@@ -287,10 +404,11 @@ class Pipeline:
         except Exception as e:
             logger.warning(f"Failed to send heartbeat: {e}")
     
-    def _log_progress(self, frame_count: int, tracks: List, current_time: float, start: float):
+    def _log_progress(self, frame_count: int, tracks: List, current_time: int, start: int):
         """Log processing progress."""
-        person_count = self._count_tracks_by_class(tracks, 'person')
-        train_count = self._count_tracks_by_class(tracks, 'train')
+        counts = Counter(t.cls_name for t in tracks)
+        person_count = counts['person']
+        train_count = counts['train']
         fps = self._calculate_fps(frame_count, current_time, start)
         camera_info = self._format_camera_info()
         
@@ -300,14 +418,10 @@ class Pipeline:
             f"FPS: {fps:.1f}"
         )
     
-    def _count_tracks_by_class(self, tracks: List, class_name: str) -> int:
-        """Count tracks by class name."""
-        return sum(1 for t in tracks if t.cls_name == class_name)
-    
-    def _calculate_fps(self, frame_count: int, current_time: float, start: float) -> float:
-        """Calculate current FPS."""
+    def _calculate_fps(self, frame_count: int, current_time: int, start: int) -> float:
+        """Calculate current FPS from monotonic ns timestamps."""
         elapsed = current_time - start
-        return frame_count / elapsed if elapsed > 0 else 0.0
+        return frame_count * _NS_PER_SECOND / elapsed if elapsed > 0 else 0.0
     
     def _handle_show_window(self, frame: np.ndarray) -> bool:
         """Handle window display and user input."""
@@ -318,13 +432,18 @@ class Pipeline:
     def _cleanup(
         self,
         cap: cv2.VideoCapture,
+        reader: FrameReader,
         worker: DetectionWorker,
         writer: Optional[cv2.VideoWriter],
         show: bool
     ):
         """Cleanup resources."""
         worker.stop()
-        cap.release()
+        # A reader stuck in read() on a stalled stream still uses the capture
+        if reader.is_alive():
+            logger.warning("Frame reader is still blocked reading the source; leaving capture open")
+        else:
+            cap.release()
         
         if writer:
             writer.release()
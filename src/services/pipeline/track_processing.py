@@ -1,13 +1,13 @@
 import logging
 import time
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.services.tracker import Track
-from src.services.activity import ActivityClassifier
-from src.services.pipeline.utils import get_class_name
-from src.utils.data_base import log_activity
-from src.utils.constants import PERIODIC_LOG_INTERVAL, DEFAULT_CAMERA_ID
-from src.utils.state_sync import save_camera_tracks
+from src.services.activity import ActivityClassifier, CLASS_OTHER
+from src.services.pipeline.utils import build_class_name_table
+from src.utils.data_base import ActivityLogWriter
+from src.utils.constants import PERIODIC_LOG_INTERVAL, DEFAULT_CAMERA_ID, TRACK_SYNC_INTERVAL
+from src.utils.state_sync import TrackRecord, save_camera_tracks
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,17 @@ class TrackProcessor:
         self._classifier = classifier
         self._camera_id = camera_id or DEFAULT_CAMERA_ID
         self._last_periodic_log_time = 0.0
+        self._last_sync_time = 0.0
+        self._log_writer = ActivityLogWriter()
+        
+        # Class id -> name / activity class code, resolved once per model
+        self._class_names = build_class_name_table(getattr(det_model, 'names', None))
+        self._class_codes = tuple(
+            ActivityClassifier.CLASS_CODES.get(name, CLASS_OTHER) for name in self._class_names
+        )
+        self._valid_cls_ids = frozenset(
+            cls_id for cls_id, name in enumerate(self._class_names) if name in VALID_CLASSES
+        )
     
     def process(self, tracks: List[Track]):
         """Process tracks: classify, log and update shared state."""
@@ -28,11 +39,23 @@ class TrackProcessor:
         self._log_activity_changes(tracks)
         self._update_shared_state(tracks)
     
+    def close(self):
+        """Flush queued activity logs and stop the log writer."""
+        self._log_writer.close()
+    
     def _classify(self, tracks: List[Track]):
         """Classify activity for tracks."""
-        names = getattr(self._det_model, 'names', None)
+        class_names = self._class_names
+        class_codes = self._class_codes
+        num_classes = len(class_names)
         for track in tracks:
-            track.cls_name = get_class_name(names, track.cls)
+            cls_id = track.cls
+            if 0 <= cls_id < num_classes:
+                track.cls_name = class_names[cls_id]
+                track.cls_code = class_codes[cls_id]
+            else:
+                track.cls_name = None
+                track.cls_code = CLASS_OTHER
         
         if not self._classifier:
             return
@@ -40,19 +63,31 @@ class TrackProcessor:
     
     def _log_activity_changes(self, tracks: List[Track]):
         """Log activities to database when activity changes or periodically."""
-        if log_activity is None:
+        # Without a classifier no track has an activity to log
+        if not self._classifier:
             return
         
         current_time = time.time()
         should_periodic_log = self._should_periodic_log(current_time)
+        rows: List[Tuple] = []
         
-        for track in tracks:
+        # The classifier reports which tracks changed, so only they are checked every frame
+        changed_ids = set()
+        for track in self._classifier.changed_tracks:
             if self._should_log_track_change(track):
-                self._log_track_activity(track)
-                continue
-            
-            if should_periodic_log and self._should_periodic_log_track(track):
-                self._log_track_activity(track, force=True)
+                self._log_track_activity(track, rows)
+                changed_ids.add(track.id)
+        
+        if should_periodic_log:
+            for track in tracks:
+                if track.id not in changed_ids and self._should_periodic_log_track(track):
+                    self._log_track_activity(track, rows, force=True)
+        
+        # One queue hand-off per frame instead of one per changed track
+        try:
+            self._log_writer.put_many(rows)
+        except Exception as e:
+            logger.warning(f"Failed to log activity: {e}")
         
         if should_periodic_log:
             self._last_periodic_log_time = current_time
@@ -63,7 +98,7 @@ class TrackProcessor:
     
     def _is_valid_track_class(self, track: Track) -> bool:
         """Check if track class is valid for logging."""
-        return track.cls_name in VALID_CLASSES
+        return track.cls in self._valid_cls_ids
     
     def _has_activity(self, track: Track) -> bool:
         """Check if track has activity."""
@@ -88,46 +123,40 @@ class TrackProcessor:
             return False
         return self._has_activity(track)
     
-    def _log_track_activity(self, track: Track, force: bool = False):
-        """Log track activity to database."""
-        if log_activity is None:
-            return
-        
+    def _log_track_activity(self, track: Track, rows: List[Tuple], force: bool = False):
+        """Add track activity to the rows logged for this frame."""
         if not track.cls_name or not track.activity:
             return
         
-        try:
-            log_activity(
-                track_id=track.id,
-                class_name=track.cls_name,
-                activity=track.activity,
-                confidence=track.activity_conf,
-                camera_id=self._camera_id
-            )
-            if not force:
-                track.previous_activity = track.activity
-        except Exception as e:
-            logger.warning(f"Failed to log activity: {e}")
+        rows.append((track.id, track.cls_name, track.activity, track.activity_conf, self._camera_id))
+        if not force:
+            track.previous_activity = track.activity
     
     def _update_shared_state(self, tracks: List[Track]):
-        """Update sync file with current active tracks."""
+        """Update sync file with current active tracks, at most every TRACK_SYNC_INTERVAL."""
+        current_time = time.time()
+        if current_time - self._last_sync_time < TRACK_SYNC_INTERVAL:
+            return
+        self._last_sync_time = current_time
+        
         track_data = self._prepare_track_data(tracks)
         
         try:
-            save_camera_tracks(self._camera_id, track_data, time.time())
+            save_camera_tracks(self._camera_id, track_data, current_time)
         except Exception as e:
             logger.warning(f"Failed to save camera tracks: {e}")
     
-    def _prepare_track_data(self, tracks: List[Track]) -> List[dict]:
+    def _prepare_track_data(self, tracks: List[Track]) -> List[TrackRecord]:
         """Prepare track data for shared state."""
+        valid_cls_ids = self._valid_cls_ids
         return [
-            {
-                'track_id': track.id,
-                'class_name': track.cls_name or 'unknown',
-                'activity': track.activity or 'unknown',
-                'confidence': track.activity_conf
-            }
+            TrackRecord(
+                track.id,
+                track.cls_name or 'unknown',
+                track.activity or 'unknown',
+                track.activity_conf
+            )
             for track in tracks
-            if self._is_valid_track_class(track)
+            if track.cls in valid_cls_ids
         ]
 
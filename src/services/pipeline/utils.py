@@ -1,4 +1,4 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 
 def get_class_name(names: Optional[Dict], cls_id: int) -> Optional[str]:
@@ -13,3 +13,12 @@ def get_class_name(names: Optional[Dict], cls_id: int) -> Optional[str]:
     except (IndexError, KeyError):
         return None
 
+
+def build_class_name_table(names: Optional[Dict]) -> Tuple[Optional[str], ...]:
+    """Flatten model class names into a tuple indexed by class id (None for gaps)."""
+    if not names:
+        return ()
+    
+    class_ids = names.keys() if isinstance(names, dict) else range(len(names))
+    return tuple(get_class_name(names, cls_id) for cls_id in range(max(class_ids) + 1))
+
@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional
+from typing import Deque, List, NamedTuple, Tuple, Optional
 import time
 import numpy as np
 
+from src.utils.constants import MAX_TRACK_HISTORY
 
-@dataclass
+
+class TrackView(NamedTuple):
+    """Immutable copy of the fields needed to draw and report a track."""
+    id: int
+    bbox: Tuple[float, float, float, float]
+    cls: int
+    score: float
+    lost_frames: int
+    history: Tuple[Tuple[int, int], ...]
+    clothing: Optional[str]
+    activity: Optional[str]
+    activity_conf: float
+    cls_name: Optional[str]
+
+
+@dataclass(slots=True)
 class Track:
     """Represents a tracked object across multiple frames."""
     id: int
@@ -16,7 +33,7 @@ class Track:
     last_seen: float = field(default_factory=time.time)
     hits: int = 1
     lost_frames: int = 0
-    history: List[Tuple[int, int]] = field(default_factory=list)  # Center positions
+    history: Deque[Tuple[int, int]] = field(default_factory=lambda: deque(maxlen=MAX_TRACK_HISTORY))  # Center positions
     velocity: Tuple[float, float] = (0.0, 0.0)  # (vx, vy) pixels per frame
     clothing: Optional[str] = None
     motion_buffer: List[float] = field(default_factory=list)
@@ -25,6 +42,7 @@ class Track:
     activity_history: List = field(default_factory=list)
     keypoints: Optional[np.ndarray] = None
     cls_name: Optional[str] = None
+    cls_code: int = 0  # ActivityClassifier.CLASS_CODES value for cls_name
     previous_activity: Optional[str] = None
 
 
@@ -40,28 +58,33 @@ class Track:
             self.velocity = (0.0, 0.0)
             return
         
-        n = min(5, len(self.history))
-        pts = self.history[-n:]
+        history = self.history
+        n = min(5, len(history))
+        k = n - 1
         
-        # Weighted average: more recent = higher weight
-        total_vx, total_vy, total_w = 0.0, 0.0, 0.0
-        for i in range(1, len(pts)):
-            weight = i
-            vx = pts[i][0] - pts[i-1][0]
-            vy = pts[i][1] - pts[i-1][1]
-            total_vx += vx * weight
-            total_vy += vy * weight
-            total_w += weight
+        # Weighted average of the last k steps, weight i for step i (more recent =
+        # higher weight). sum(i * (p[i] - p[i-1])) telescopes to
+        # k * p[k] - (p[0] + ... + p[k-1]), and the weights sum to k(k+1)/2.
+        sum_x = sum_y = 0
+        for i in range(-n, -1):
+            x, y = history[i]
+            sum_x += x
+            sum_y += y
+        last_x, last_y = history[-1]
+        total_w = k * (k + 1) / 2
         
-        self.velocity = (total_vx / total_w, total_vy / total_w) if total_w > 0 else (0.0, 0.0)
+        self.velocity = ((k * last_x - sum_x) / total_w, (k * last_y - sum_y) / total_w)
 
-    def add_position(self, cx: int, cy: int, max_history: int = 50):
-        self.history.append((cx, cy))
-        if len(self.history) > max_history:
-            self.history.pop(0)
-
-    @property
-    def center(self) -> Tuple[int, int]:
-        x1, y1, x2, y2 = self.bbox
-        return int((x1 + x2) / 2), int((y1 + y2) / 2)
+    def move_to(self, bbox: Tuple[float, float, float, float]):
+        """Set bbox and record its center in history, computing the center once."""
+        self.bbox = bbox
+        x1, y1, x2, y2 = bbox
+        # history is bounded by its maxlen, so the oldest position drops off in O(1)
+        self.history.append((int((x1 + x2) / 2), int((y1 + y2) / 2)))
 
+    def snapshot(self) -> TrackView:
+        """Copy current state so other threads can read it while the tracker keeps updating."""
+        return TrackView(
+            self.id, self.bbox, self.cls, self.score, self.lost_frames, tuple(self.history),
+            self.clothing, self.activity, self.activity_conf, self.cls_name
+        )
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Union
 import time
 import numpy as np
 
 from src.services.track import Track
+from src.services.tracker_kernels import fill_iou_matrix
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    # Fall back to greedy matching without SciPy
+    linear_sum_assignment = None
 
 BBox = Tuple[float, float, float, float]
 Detection = Tuple[float, float, float, float, int, float]  # x1, y1, x2, y2, cls, score
@@ -26,20 +33,28 @@ def compute_iou(box_a: BBox, box_b: BBox) -> float:
     return inter / union if union > 0 else 0.0
 
 
+def _box_areas(boxes: np.ndarray) -> np.ndarray:
+    """Areas of (N, 4) x1, y1, x2, y2 boxes, with inverted boxes counted as empty."""
+    wh = np.clip(boxes[:, 2:] - boxes[:, :2], 0, None)
+    return wh[:, 0] * wh[:, 1]
+
+
 class Matcher:
-    """Matches detections to tracks using IoU similarity with greedy matching."""
+    """Matches detections to tracks using IoU similarity (optimal assignment, or greedy without SciPy)."""
     
     def __init__(self, iou_threshold: float):
         self.iou_threshold = iou_threshold
     
-    def match(self, detections: List[BBox], tracks: Dict[int, Track], use_prediction: bool) -> Dict[int, int]:
-        """Match detections to tracks using greedy IoU matching."""
-        if not tracks or not detections:
+    def match(self, detections: Union[List[BBox], np.ndarray], tracks: Dict[int, Track], use_prediction: bool) -> Dict[int, int]:
+        """Match detection boxes (list or (N, 4) array) to tracks by IoU."""
+        if not tracks or len(detections) == 0:
             return {}
         
         track_ids = list(tracks.keys())
         track_boxes = [self._get_track_box(tracks[tid], use_prediction) for tid in track_ids]
         iou_matrix = self._build_iou_matrix(detections, track_boxes)
+        if linear_sum_assignment is not None:
+            return self._optimal_match(iou_matrix, track_ids)
         return self._greedy_match(iou_matrix, track_ids)
     
     def _get_track_box(self, track: Track, use_prediction: bool) -> BBox:
@@ -48,35 +63,55 @@ class Matcher:
             return track.predict_bbox()
         return track.bbox
     
-    def _build_iou_matrix(self, detections: List[BBox], track_boxes: List[BBox]) -> np.ndarray:
-        """Build IoU similarity matrix."""
-        matrix = np.zeros((len(detections), len(track_boxes)))
-        for i, det_box in enumerate(detections):
-            for j, track_box in enumerate(track_boxes):
-                matrix[i, j] = compute_iou(det_box, track_box)
-        return matrix
+    def _build_iou_matrix(self, detections: Union[List[BBox], np.ndarray], track_boxes: List[BBox]) -> np.ndarray:
+        """Build IoU similarity matrix for all detection/track pairs at once (same math as compute_iou)."""
+        # C order is the layout the IoU kernel is compiled for at import; a column
+        # slice such as Tracker.update's box array would trigger a second compile
+        det_arr = np.ascontiguousarray(detections, dtype=np.float64).reshape(-1, 4)
+        track_arr = np.ascontiguousarray(track_boxes, dtype=np.float64).reshape(-1, 4)
+        
+        # For the small matrices seen per frame the compiled loop beats
+        # broadcasting, which allocates several (N, M) temporaries
+        if fill_iou_matrix is not None:
+            matrix = np.empty((len(det_arr), len(track_arr)))
+            fill_iou_matrix(det_arr, track_arr, matrix)
+            return matrix
+        
+        top_left = np.maximum(det_arr[:, None, :2], track_arr[None, :, :2])
+        bottom_right = np.minimum(det_arr[:, None, 2:], track_arr[None, :, 2:])
+        inter_wh = np.clip(bottom_right - top_left, 0, None)
+        inter = inter_wh[..., 0] * inter_wh[..., 1]
+        
+        area_det = _box_areas(det_arr)
+        area_track = _box_areas(track_arr)
+        union = area_det[:, None] + area_track[None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    
+    def _optimal_match(self, iou_matrix: np.ndarray, track_ids: List[int]) -> Dict[int, int]:
+        """Hungarian matching: maximize total IoU over pairs at or above threshold."""
+        # Pairs below threshold can never match, so they must not pull the assignment
+        gated = np.where(iou_matrix >= self.iou_threshold, iou_matrix, 0.0)
+        rows, cols = linear_sum_assignment(gated, maximize=True)
+        return {
+            int(i): track_ids[j]
+            for i, j in zip(rows, cols)
+            if gated[i, j] > 0
+        }
     
     def _greedy_match(self, iou_matrix: np.ndarray, track_ids: List[int]) -> Dict[int, int]:
         """Greedy matching: iteratively match highest IoU pairs above threshold."""
         mapping: Dict[int, int] = {}
-        used_dets: Set[int] = set()
-        used_tracks: Set[int] = set()
         
-        while iou_matrix.size > 0:
+        # Each match retires its detection row and track column (set below any
+        # IoU), so argmax never returns an already used detection or track
+        for _ in range(min(iou_matrix.shape)):
             i, j = np.unravel_index(iou_matrix.argmax(), iou_matrix.shape)
-            i = int(i)
-            j = int(j)
-            iou_value = iou_matrix[i, j]
-            
-            if iou_value < self.iou_threshold:
+            if iou_matrix[i, j] < self.iou_threshold:
                 break
             
-            if i not in used_dets and j not in used_tracks:
-                mapping[i] = track_ids[j]
-                used_dets.add(i)
-                used_tracks.add(j)
-            
-            iou_matrix[i, j] = 0
+            mapping[int(i)] = track_ids[j]
+            iou_matrix[i, :] = -1.0
+            iou_matrix[:, j] = -1.0
         
         return mapping
 
@@ -91,26 +126,24 @@ class TrackManager:
     
     def create_track(self, box: BBox, cls: int, score: float) -> Track:
         """Create new track for unmatched detection."""
-        cx, cy = int((box[0] + box[2]) / 2), int((box[1] + box[3]) / 2)
         track = Track(
             id=self._next_id,
             bbox=box,
             cls=cls,
-            score=score,
-            history=[(cx, cy)]
+            score=score
         )
+        track.move_to(box)
         self._next_id += 1
         return track
     
     def update_track(self, track: Track, box: BBox, cls: int, score: float):
         """Update track with new detection."""
-        track.bbox = box
+        track.move_to(box)
         track.cls = cls
         track.score = score
         track.last_seen = time.time()
         track.hits += 1
         track.lost_frames = 0
-        track.add_position(*track.center)
         track.update_velocity()
     
     def update_lost_tracks(self, tracks: Dict[int, Track], updated_ids: Set[int]):
@@ -135,8 +168,7 @@ class TrackManager:
         decay = max(0.5, 1.0 - track.lost_frames * 0.02)
         vx, vy = track.velocity
         track.velocity = (vx * decay, vy * decay)
-        track.bbox = track.predict_bbox()
-        track.add_position(*track.center)
+        track.move_to(track.predict_bbox())
 
 
 class Tracker:
@@ -147,13 +179,16 @@ class Tracker:
         self.track_manager = TrackManager(max_lost, use_prediction)
         self.tracks: Dict[int, Track] = {}
     
-    def update(self, detections: List[Detection]):
-        """Update tracker with new detections."""
-        boxes: List[BBox] = [tuple(d[:4]) for d in detections]  # type: ignore
-        classes = [int(d[4]) for d in detections]
-        scores = [float(d[5]) for d in detections]
+    def update(self, detections: Union[List[Detection], np.ndarray]):
+        """Update tracker with new detections (list of tuples or (N, 6) array)."""
+        # Split the columns once; the matcher works on the box array directly
+        det_arr = np.asarray(detections, dtype=np.float64).reshape(-1, 6)
+        box_arr = det_arr[:, :4]
+        boxes: List[BBox] = [tuple(box) for box in box_arr.tolist()]  # type: ignore
+        classes: List[int] = det_arr[:, 4].astype(np.intp).tolist()
+        scores: List[float] = det_arr[:, 5].tolist()
         
-        mapping = self.matcher.match(boxes, self.tracks, self.track_manager.use_prediction)
+        mapping = self.matcher.match(box_arr, self.tracks, self.track_manager.use_prediction)
         updated_ids = self._update_matched_tracks(mapping, boxes, classes, scores)
         self._create_new_tracks(mapping, boxes, classes, scores)
         self.track_manager.update_lost_tracks(self.tracks, updated_ids)
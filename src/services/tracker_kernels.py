@@ -0,0 +1,30 @@
+"""Optional Numba kernels for the tracker; every name is None when Numba is not installed."""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def fill_iou_matrix(det_boxes, track_boxes, out):
+        """Fill out[i, j] with the IoU of det_boxes[i] and track_boxes[j] (same math as compute_iou)."""
+        for i in range(det_boxes.shape[0]):
+            xa1, ya1, xa2, ya2 = det_boxes[i, 0], det_boxes[i, 1], det_boxes[i, 2], det_boxes[i, 3]
+            area_a = max(0.0, xa2 - xa1) * max(0.0, ya2 - ya1)
+            for j in range(track_boxes.shape[0]):
+                xb1, yb1, xb2, yb2 = track_boxes[j, 0], track_boxes[j, 1], track_boxes[j, 2], track_boxes[j, 3]
+                inter = max(0.0, min(xa2, xb2) - max(xa1, xb1)) * max(0.0, min(ya2, yb2) - max(ya1, yb1))
+                area_b = max(0.0, xb2 - xb1) * max(0.0, yb2 - yb1)
+                union = area_a + area_b - inter
+                out[i, j] = inter / union if union > 0.0 else 0.0
+    
+    # Compile (or load from the on-disk cache) now rather than on the first frame
+    fill_iou_matrix(np.zeros((1, 4)), np.zeros((1, 4)), np.empty((1, 1)))
+else:
+    fill_iou_matrix = None
+
+
+__all__ = ["fill_iou_matrix"]
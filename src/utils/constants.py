@@ -2,6 +2,14 @@
 LOG_INTERVAL = 5.0  # seconds between progress logs
 HEARTBEAT_INTERVAL = 2.0  # seconds between heartbeats
 PERIODIC_LOG_INTERVAL = 30.0  # seconds between periodic activity logs
+ACTIVITY_FLUSH_INTERVAL = 1.0  # seconds between activity log flushes
+ACTIVITY_FLUSH_SIZE = 256  # queued activity rows that trigger an early flush
+TRACK_SYNC_INTERVAL = 0.25  # minimum seconds between track sync file writes
+FRAME_QUEUE_SIZE = 4  # decoded frames buffered ahead of processing / behind writing
+CLOCK_POLL_FRAMES = 16  # frames between clock reads for heartbeat/progress checks (power of two)
+
+# Video sources
+STREAM_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://")  # live network streams
 
 # State synchronization timeouts
 HEARTBEAT_TIMEOUT = 60.0  # seconds before camera is considered inactive
@@ -17,6 +25,7 @@ DEFAULT_ACTIVITY_WINDOW = 30
 DEFAULT_PERSON_SPEED_THRESHOLD = 0.5
 DEFAULT_VEHICLE_DISPLACEMENT_THRESHOLD = 10.0
 DEFAULT_VEHICLE_MIN_HISTORY = 5
+MAX_TRACK_HISTORY = 50  # center positions kept per track
 
 # UI constants
 WINDOW_NAME = "AI-Hackathon"
@@ -1,10 +1,96 @@
+import atexit
+import logging
+import queue
+import threading
+from datetime import datetime
+from itertools import groupby
+from typing import List, Tuple
+
+from src.utils.constants import ACTIVITY_FLUSH_INTERVAL, ACTIVITY_FLUSH_SIZE
+
 try:
-    from web.api.utils.database import log_activity
+    from web.api.utils.database import log_activity, log_activities
 except ImportError:
     # Fallback if web module is not available
     def log_activity(*args, **kwargs):
         """Fallback function if database module is not available."""
         pass
 
-__all__ = ["log_activity"]
+    def log_activities(*args, **kwargs):
+        """Fallback function if database module is not available."""
+        pass
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Queues activity rows and writes them to the database from a background thread."""
+    def __init__(self, flush_interval: float = ACTIVITY_FLUSH_INTERVAL, flush_size: int = ACTIVITY_FLUSH_SIZE):
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        # Each item is one put_many batch: (timestamp, rows)
+        self._queue: "queue.Queue[Tuple[str, List[Tuple]]]" = queue.Queue()
+        self._queued_rows = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def put_many(self, rows: List[Tuple]):
+        """
+        Queue several activity rows as one batch, stamped with the current time.
+        
+        Args:
+            rows: List of (track_id, class_name, activity, confidence, camera_id) tuples
+        """
+        if not rows:
+            return
+        
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._queue.put((timestamp, rows))
+        # Only a flush hint, so the unlocked update racing with _drain is harmless
+        self._queued_rows += len(rows)
+        if self._queued_rows >= self._flush_size:
+            self._wake.set()
+    
+    def flush(self):
+        """Write all queued rows, one transaction per distinct timestamp."""
+        with self._flush_lock:
+            pending = self._drain()
+            for timestamp, group in groupby(pending, key=lambda item: item[0]):
+                try:
+                    log_activities([row for _, rows in group for row in rows], timestamp=timestamp)
+                except Exception as e:
+                    logger.warning(f"Failed to flush activity logs: {e}")
+    
+    def close(self):
+        """Stop the flusher thread and write the remainder."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+        atexit.unregister(self.close)
+    
+    def _drain(self) -> List[Tuple[str, List[Tuple]]]:
+        """Take everything currently queued."""
+        self._queued_rows = 0
+        pending = []
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                return pending
+    
+    def _run(self):
+        """Flush on a timer, or early once enough rows are queued."""
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
 
+__all__ = ["log_activity", "log_activities", "ActivityLogWriter"]
@@ -1,9 +1,12 @@
-import json
 import logging
 import os
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 from src.utils.constants import HEARTBEAT_TIMEOUT, STOP_TIMEOUT
 
@@ -14,6 +17,20 @@ SYNC_FILE = PROJECT_ROOT / "data" / "shared_state_sync.json"
 SYNC_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
+@dataclass(slots=True)
+class TrackRecord:
+    """Track entry in the sync file; orjson writes it as an object with these keys."""
+    track_id: int
+    class_name: str
+    activity: str
+    confidence: float
+
+
+_cache_lock = threading.Lock()
+_cached_stat: Optional[Tuple[int, int]] = None
+_cached_data: Dict = {}
+
+
 def _read_file() -> Dict:
     """Read sync file with retry logic."""
     max_retries = 3
@@ -23,9 +40,9 @@ def _read_file() -> Dict:
         try:
             if not SYNC_FILE.exists():
                 return {}
-            with open(SYNC_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError, OSError):
+            with open(SYNC_FILE, 'rb') as f:
+                return orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError, OSError):
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
                 continue
@@ -36,6 +53,27 @@ def _read_file() -> Dict:
     return {}
 
 
+def _read_file_cached() -> Dict:
+    """Read sync file for read-only use, re-parsing only when it changed on disk."""
+    global _cached_stat, _cached_data
+    
+    try:
+        stat = SYNC_FILE.stat()
+    except OSError:
+        return {}
+    
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        if key == _cached_stat:
+            return _cached_data
+    
+    data = _read_file()
+    with _cache_lock:
+        _cached_stat = key
+        _cached_data = data
+    return data
+
+
 def _write_file(data: Dict):
     """Write sync file with retry logic."""
     max_retries = 5
@@ -43,8 +81,9 @@ def _write_file(data: Dict):
     
     for attempt in range(max_retries):
         try:
-            with open(SYNC_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Compact orjson output: smaller file, and much cheaper to dump and parse
+            with open(SYNC_FILE, 'wb') as f:
+                f.write(orjson.dumps(data))
                 f.flush()
                 os.fsync(f.fileno())
             return  # Success
@@ -115,7 +154,7 @@ def heartbeat_camera(camera_id: str):
         logger.warning(f"Error sending heartbeat: {e}")
 
 
-def save_camera_tracks(camera_id: str, tracks: List[Dict], timestamp: float):
+def save_camera_tracks(camera_id: str, tracks: List[TrackRecord], timestamp: float):
     """Save camera tracks to sync file."""
     try:
         data = _read_file()
@@ -152,7 +191,7 @@ def _is_camera_running(camera_data: Dict, current_time: float) -> bool:
 def get_running_camera_ids() -> List[str]:
     """Get list of camera IDs that are currently running."""
     try:
-        data = _read_file()
+        data = _read_file_cached()
         current_time = time.time()
         return [
             camera_id for camera_id, camera_data in data.items()
@@ -165,7 +204,7 @@ def get_running_camera_ids() -> List[str]:
 def get_all_camera_tracks() -> Dict[str, List[Dict]]:
     """Get all camera tracks for running cameras only."""
     try:
-        data = _read_file()
+        data = _read_file_cached()
         current_time = time.time()
         return {
             camera_id: camera_data.get('tracks', [])
@@ -1,15 +1,20 @@
 import sys
+import hashlib
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 
-from fastapi import FastAPI, HTTPException, Query, status
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ConfigDict, Field
 
-from web.api.utils.database import get_logs, get_log_count, get_active_camera_ids
+from web.api.utils.cache import TTLCache
+from web.api.utils.database import get_logs, get_log_count, get_latest_log_id, get_active_camera_ids
 from web.api.utils.shared_state import get_shared_state
 from web.api.utils.state_sync import (
     get_running_camera_ids,
@@ -26,11 +31,41 @@ DEFAULT_LIMIT = 100
 MAX_LIMIT = 1000
 CAMERA_NOT_FOUND_THRESHOLD = 300  # seconds
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+STATS_CACHE_TTL = 0.5  # seconds
+LOG_COUNT_CACHE_TTL = 1.0  # seconds
+
+_stats_cache = TTLCache(ttl=STATS_CACHE_TTL, maxsize=1)
+_log_count_cache = TTLCache(ttl=LOG_COUNT_CACHE_TTL)
+
+# Static payloads are serialized once at import instead of on every request
+_ROOT_BODY = orjson.dumps({
+    "name": API_NAME,
+    "version": API_VERSION,
+    "endpoints": {
+        "detections": "/detections",
+        "stats": "/stats/current",
+        "docs": "/docs"
+    }
+})
+_HEALTHY_BODY = orjson.dumps({
+    "status": "healthy",
+    "database": "connected",
+    "service": API_NAME
+})
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 
 app = FastAPI(
     title=API_NAME,
     version=API_VERSION,
-    description="Real-time monitoring of YOLO object detection and activity tracking"
+    description="Real-time monitoring of YOLO object detection and activity tracking",
+    default_response_class=ORJSONResponse
 )
 
 ALLOWED_ORIGINS = [
@@ -46,9 +81,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=["X-Total-Count", "ETag"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Pydantic models
 class Detection(BaseModel):
     """Detection log entry."""
@@ -65,9 +102,10 @@ class Detection(BaseModel):
 
 class DetectionResponse(BaseModel):
     """Response for detection list endpoint."""
-    total: int
+    total: Optional[int]
     limit: int
     offset: int
+    next_cursor: Optional[int] = None
     detections: List[Detection]
 
 
@@ -110,16 +148,38 @@ def _create_current_stats(person: int, train: int, total: int) -> CurrentStats:
 
 
 def _format_detection(log: Dict) -> Detection:
-    """Format database log entry to Detection model."""
-    return Detection(
-        id=log["id"],
-        track_id=log["track_id"],
-        class_name=log["class"],
-        activity=log["activity"],
-        confidence=float(log["confidence"]),
-        timestamp=log["timestamp"],
-        camera_id=log.get("camera_id")
-    )
+    """Format database log entry to Detection model. Rows are typed by the schema, so validation is skipped."""
+    return Detection.model_construct(**log)
+
+
+def _get_cached_log_count(
+    latest_id: int,
+    class_filter: Optional[str],
+    activity_filter: Optional[str],
+    camera_id: Optional[str]
+) -> int:
+    """
+    Get log count, reusing a recent result for the same filters and latest log ID.
+    
+    Keying on the latest ID keeps the count in step with the ETag, which is
+    versioned by the same ID, so a 304 never pins a stale total.
+    """
+    key = (latest_id, class_filter, activity_filter, camera_id)
+    total = _log_count_cache.get(key)
+    if total is None:
+        total = get_log_count(
+            class_filter=class_filter,
+            activity_filter=activity_filter,
+            camera_id=camera_id
+        )
+        _log_count_cache.set(key, total)
+    return total
+
+
+def _make_detections_etag(latest_id: int, *params) -> str:
+    """Build ETag for a detections page. Logs are append-only, so the latest ID versions every page."""
+    digest = hashlib.blake2b(repr((latest_id, *params)).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
 
 
 def _format_camera_name(camera_id: str) -> str:
@@ -143,6 +203,14 @@ def _create_camera_response(camera_id: str, sync_stats: Dict[str, int]) -> Camer
     )
 
 
+def _list_running_cameras() -> List[Camera]:
+    """Build Camera responses for all running cameras from the sync file."""
+    return [
+        _create_camera_response(camera_id, get_sync_stats(camera_id))
+        for camera_id in sorted(get_running_camera_ids())
+    ]
+
+
 def _check_camera_exists(camera_id: str, shared_state) -> bool:
     """Check if camera exists in database or sync state."""
     if camera_id in shared_state.get_camera_ids():
@@ -183,19 +251,12 @@ def _handle_general_error(e: Exception, operation: str):
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    return {
-        "name": API_NAME,
-        "version": API_VERSION,
-        "endpoints": {
-            "detections": "/detections",
-            "stats": "/stats/current",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/detections", response_model=DetectionResponse)
 async def get_detection_logs(
+    request: Request,
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="Maximum number of records"),
     offset: int = Query(0, ge=0, description="Number of records to skip"),
     class_filter: Optional[Literal["person", "train"]] = Query(
@@ -206,7 +267,9 @@ async def get_detection_logs(
         None, 
         description="Filter by activity (standing, moving, stopped)"
     ),
-    camera_id: Optional[str] = Query(None, description="Filter by camera ID (for future use)")
+    camera_id: Optional[str] = Query(None, description="Filter by camera ID (for future use)"),
+    cursor: Optional[int] = Query(None, ge=1, description="Return records older than this cursor"),
+    include_total: bool = Query(True, description="Include total count of matching records")
 ):
     """
     Get detection logs from database.
@@ -216,35 +279,57 @@ async def get_detection_logs(
     - **class_filter**: Filter by object class (person, train)
     - **activity_filter**: Filter by activity (standing, moving, stopped)
     - **camera_id**: Filter by camera ID (for future use)
+    - **cursor**: Keyset pagination cursor (`next_cursor` of the previous page); offset is ignored when set
+    - **include_total**: Set to false to skip counting all matching records
     """
     try:
-        logs = get_logs(
-            limit=limit,
-            offset=offset,
-            class_filter=class_filter,
-            activity_filter=activity_filter,
-            camera_id=camera_id
+        latest_id = await run_in_threadpool(get_latest_log_id)
+        etag = _make_detections_etag(
+            latest_id, limit, offset, class_filter, activity_filter, camera_id, cursor, include_total
         )
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         
-        total = get_log_count(
+        # A cursor already marks the page start, so offset only applies without one.
+        # One extra row is fetched to tell whether a next page exists.
+        logs = await run_in_threadpool(
+            get_logs,
+            limit=limit + 1,
+            offset=offset if cursor is None else 0,
             class_filter=class_filter,
             activity_filter=activity_filter,
-            camera_id=camera_id
+            camera_id=camera_id,
+            before_id=cursor
         )
         
+        total = None
+        if include_total:
+            total = await run_in_threadpool(
+                _get_cached_log_count,
+                latest_id,
+                class_filter,
+                activity_filter,
+                camera_id
+            )
+        
+        has_more = len(logs) > limit
+        logs = logs[:limit]
         formatted_detections = [_format_detection(log) for log in logs]
+        next_cursor = logs[-1]["id"] if has_more else None
         
         response = DetectionResponse(
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=next_cursor,
             detections=formatted_detections
         )
         
-        return JSONResponse(
-            content=response.model_dump(),
-            headers={"X-Total-Count": str(total)}
-        )
+        headers = {"ETag": etag}
+        if total is not None:
+            headers["X-Total-Count"] = str(total)
+        
+        return ORJSONResponse(content=response.model_dump(), headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -259,8 +344,10 @@ async def get_current_stats():
     Returns counts of person and train objects currently being tracked.
     """
     try:
-        shared_state = get_shared_state()
-        stats = shared_state.get_stats()
+        stats = _stats_cache.get("current")
+        if stats is None:
+            stats = get_shared_state().get_stats()
+            _stats_cache.set("current", stats)
         
         return _create_current_stats(
             person=stats.get('person', 0),
@@ -280,11 +367,7 @@ async def get_cameras():
     Uses file-based sync for multiprocessing support.
     """
     try:
-        running_camera_ids = get_running_camera_ids()
-        cameras = [
-            _create_camera_response(camera_id, get_sync_stats(camera_id))
-            for camera_id in sorted(running_camera_ids)
-        ]
+        cameras = await run_in_threadpool(_list_running_cameras)
         
         return CameraListResponse(cameras=cameras, total=len(cameras))
     except Exception as e:
@@ -305,7 +388,7 @@ async def get_camera_stats(camera_id: str):
     try:
         shared_state = get_shared_state()
         shared_stats = shared_state.get_stats(camera_id=camera_id)
-        sync_stats = get_sync_stats(camera_id)
+        sync_stats = await run_in_threadpool(get_sync_stats, camera_id)
         
         person_count = max(shared_stats.get('person', 0), sync_stats.get('person', 0))
         train_count = max(shared_stats.get('train', 0), sync_stats.get('train', 0))
@@ -314,7 +397,7 @@ async def get_camera_stats(camera_id: str):
         if not _should_check_camera_exists(total_tracks, camera_id, shared_state):
             return _create_current_stats(person_count, train_count, total_tracks)
         
-        if not _check_camera_exists(camera_id, shared_state):
+        if not await run_in_threadpool(_check_camera_exists, camera_id, shared_state):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Camera {camera_id} not found"
@@ -338,12 +421,9 @@ def _should_check_camera_exists(total_tracks: int, camera_id: str, shared_state)
 async def health_check():
     """Health check endpoint."""
     try:
-        get_log_count()
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "service": API_NAME
-        }
+        # MAX(id) is an index lookup; COUNT(*) would scan the whole table
+        await run_in_threadpool(get_latest_log_id)
+        return Response(content=_HEALTHY_BODY, media_type="application/json")
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         raise HTTPException(
@@ -355,7 +435,7 @@ async def health_check():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """Custom exception handler for better error responses."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -368,7 +448,7 @@ async def http_exception_handler(request, exc: HTTPException):
 async def general_exception_handler(request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.error(f"Unexpected error: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "Internal server error",
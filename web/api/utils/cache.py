@@ -0,0 +1,51 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Small thread-safe mapping whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Time in seconds an entry stays valid after it is set
+            maxsize: Maximum number of entries kept at once
+        """
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get cached value, or default if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key for the configured TTL."""
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._data and len(self._data) >= self._maxsize:
+                self._evict(now)
+            self._data[key] = (now + self._ttl, value)
+
+    def _evict(self, now: float):
+        """Drop expired entries, or the oldest entry if none expired."""
+        expired = [key for key, (expires, _) in self._data.items() if expires <= now]
+        for key in expired:
+            del self._data[key]
+
+        if len(self._data) >= self._maxsize:
+            del self._data[next(iter(self._data))]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
@@ -2,8 +2,10 @@ import sqlite3
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 from contextlib import contextmanager
+import os
+import queue
 import threading
 
 logger = logging.getLogger(__name__)
@@ -12,23 +14,142 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
 DATABASE_DIR = PROJECT_ROOT / "data" / "database"
 DATABASE_DIR.mkdir(parents=True, exist_ok=True)
 LOGS_DB = str(DATABASE_DIR / "logs.db")
+READER_POOL_SIZE = 4
 
 _db_lock = threading.Lock()
+# Writer connection shared by all writes in this process, as (pid, connection)
+_writer: Optional[Tuple[int, sqlite3.Connection]] = None
+_reader_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=READER_POOL_SIZE)
+
+# WAL lets the API read while the pipeline writes; synchronous=NORMAL drops
+# the per-commit fsync of the main database file.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=5000;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+"""
+
+# Read-only connections cannot switch the journal mode; the writer persists WAL
+_READER_PRAGMAS = """
+PRAGMA busy_timeout=5000;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+"""
+
+_INSERT_LOG_SQL = (
+    "INSERT INTO logs (track_id, class, activity, confidence, timestamp, camera_id) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Columns returned by get_logs, named as the API exposes them
+_LOG_COLUMNS = "id, track_id, class AS class_name, activity, confidence, timestamp, camera_id"
+
+
+def _tune_connection(conn: sqlite3.Connection):
+    """Apply write-throughput and concurrency pragmas to a new connection."""
+    conn.executescript(_CONNECTION_PRAGMAS)
+
+
+def _open_writer_connection() -> sqlite3.Connection:
+    """Open a read-write connection to the logs database."""
+    conn = sqlite3.connect(LOGS_DB, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    _tune_connection(conn)
+    return conn
 
 
 @contextmanager
 def _get_connection():
-    conn = None
+    """
+    Use the process-wide writer connection; callers hold _db_lock.
+    
+    The connection stays open between writes instead of being reopened and
+    re-tuned per call. It is opened on first use and reopened after a database
+    error; connections are closed before fork(), since SQLite handles must not
+    be used or closed across it.
+    """
+    global _writer
+    
+    pid = os.getpid()
+    if _writer is None or _writer[0] != pid:
+        _writer = (pid, _open_writer_connection())
+    conn = _writer[1]
+    
     try:
-        conn = sqlite3.connect(LOGS_DB, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
         yield conn
+    except sqlite3.Error as e:
+        logger.error(f"Database error: {e}")
+        _writer = None
+        conn.close()
+        raise
+
+
+def _close_connections():
+    """Close the writer and pooled reader connections of this process."""
+    global _writer
+    
+    if _writer is not None:
+        _writer[1].close()
+        _writer = None
+    while True:
+        try:
+            _reader_pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+
+def _close_connections_before_fork():
+    """Close connections before fork() so no SQLite handle crosses into the child; the lock is released after fork."""
+    _db_lock.acquire()
+    _close_connections()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_close_connections_before_fork,
+        after_in_parent=_db_lock.release,
+        after_in_child=_db_lock.release
+    )
+
+
+def _open_reader_connection() -> sqlite3.Connection:
+    """Open a read-only connection to the logs database."""
+    conn = sqlite3.connect(f"{Path(LOGS_DB).as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_READER_PRAGMAS)
+    return conn
+
+
+@contextmanager
+def _get_reader_connection():
+    """
+    Borrow a pooled read-only connection.
+    
+    In WAL mode readers work on a snapshot and never block the writer, so
+    reads skip the write lock.
+    """
+    try:
+        conn = _reader_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_reader_connection()
+    
+    reusable = False
+    try:
+        yield conn
+        reusable = True
     except sqlite3.Error as e:
         logger.error(f"Database error: {e}")
         raise
     finally:
-        if conn:
+        if not reusable:
             conn.close()
+        else:
+            try:
+                _reader_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
 
 
 def init_logs_db():
@@ -43,13 +164,20 @@ def init_logs_db():
         timestamp TEXT NOT NULL,
         camera_id TEXT
     );
+    CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_logs_class_timestamp ON logs(class, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_logs_class_activity_timestamp ON logs(class, activity, timestamp);
+    """
+    # Created after the camera_id migration below, since older tables lack the column.
+    # Serves the per-camera stats range and is a covering index for active cameras.
+    index_sql = """
+    CREATE INDEX IF NOT EXISTS idx_logs_camera_timestamp ON logs(camera_id, timestamp);
     """
     
     with _db_lock:
         try:
             with _get_connection() as conn:
-                conn.execute(sql)
-                conn.commit()
+                conn.executescript(sql)
                 
                 cursor = conn.cursor()
                 cursor.execute("PRAGMA table_info(logs)")
@@ -59,8 +187,14 @@ def init_logs_db():
                     logger.info("Adding camera_id column to logs table")
                     conn.execute("ALTER TABLE logs ADD COLUMN camera_id TEXT")
                     conn.commit()
+                
+                conn.executescript(index_sql)
         except sqlite3.Error as e:
             logger.error(f"Error initializing logs DB: {e}")
+        finally:
+            # Runs at import, possibly in a process that forks camera workers
+            # later; the writer is reopened on first write instead
+            _close_connections()
 
 
 def log_activity(
@@ -85,18 +219,40 @@ def log_activity(
     if timestamp is None:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    sql = """
-    INSERT INTO logs (track_id, class, activity, confidence, timestamp, camera_id)
-    VALUES (?, ?, ?, ?, ?, ?)
+    with _db_lock:
+        try:
+            with _get_connection() as conn:
+                conn.execute(_INSERT_LOG_SQL, (track_id, class_name, activity, confidence, timestamp, camera_id))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error logging activity: {e}")
+
+
+def log_activities(rows: Iterable[Tuple], timestamp: Optional[str] = None):
+    """
+    Log a batch of activities to the database in a single transaction.
+    
+    Args:
+        rows: Iterable of (track_id, class_name, activity, confidence, camera_id) tuples
+        timestamp: Optional timestamp shared by the batch (defaults to current time)
     """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    params = [
+        (track_id, class_name, activity, confidence, timestamp, camera_id)
+        for track_id, class_name, activity, confidence, camera_id in rows
+    ]
+    if not params:
+        return
     
     with _db_lock:
         try:
             with _get_connection() as conn:
-                conn.execute(sql, (track_id, class_name, activity, confidence, timestamp, camera_id))
+                conn.executemany(_INSERT_LOG_SQL, params)
                 conn.commit()
         except sqlite3.Error as e:
-            logger.error(f"Error logging activity: {e}")
+            logger.error(f"Error logging activities: {e}")
 
 
 def _build_filter_query(
@@ -128,10 +284,11 @@ def get_logs(
     offset: int = 0,
     class_filter: Optional[str] = None,
     activity_filter: Optional[str] = None,
-    camera_id: Optional[str] = None
+    camera_id: Optional[str] = None,
+    before_id: Optional[int] = None
 ) -> List[Dict]:
     """
-    Retrieve logs from database.
+    Retrieve logs from database, newest first.
     
     Args:
         limit: Maximum number of records to return
@@ -139,40 +296,41 @@ def get_logs(
         class_filter: Filter by class name (optional)
         activity_filter: Filter by activity (optional)
         camera_id: Filter by camera ID (optional)
+        before_id: Only return logs that sort after this log ID, for keyset pagination (optional)
     
     Returns:
         List of log dictionaries
     """
     sql, params = _build_filter_query(class_filter, activity_filter, camera_id)
+    sql = sql.replace("SELECT *", f"SELECT {_LOG_COLUMNS}")
+    
+    # Camera processes flush their buffered rows up to a second late, so IDs
+    # follow flush order rather than time; order by (timestamp, id) instead.
+    # No filter, class, class + activity and camera each have an index with the
+    # equality columns first and timestamp (then the implicit rowid) last, so
+    # SQLite walks it without sorting. Activity-only and mixed camera filters
+    # fall back to walking idx_logs_timestamp and skipping rows.
+    if before_id is not None:
+        sql += " AND (timestamp, id) < (SELECT timestamp, id FROM logs WHERE id = ?)"
+        params.append(before_id)
+    
     sql += " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
     
-    with _db_lock:
-        try:
-            with _get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, params)
-                rows = cursor.fetchall()
-                return _rows_to_dicts(rows)
-        except sqlite3.Error as e:
-            logger.error(f"Error retrieving logs: {e}")
-            return []
+    try:
+        with _get_reader_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            return _rows_to_dicts(rows)
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving logs: {e}")
+        return []
 
 
 def _rows_to_dicts(rows: List) -> List[Dict]:
     """Convert SQLite rows to dictionaries."""
-    return [
-        {
-            "id": row["id"],
-            "track_id": row["track_id"],
-            "class": row["class"],
-            "activity": row["activity"],
-            "confidence": row["confidence"],
-            "timestamp": row["timestamp"],
-            "camera_id": row["camera_id"] if "camera_id" in row.keys() else None
-        }
-        for row in rows
-    ]
+    return [dict(row) for row in rows]
 
 
 def get_log_count(
@@ -184,16 +342,26 @@ def get_log_count(
     sql, params = _build_filter_query(class_filter, activity_filter, camera_id)
     sql = sql.replace("SELECT *", "SELECT COUNT(*) as count")
     
-    with _db_lock:
-        try:
-            with _get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, params)
-                row = cursor.fetchone()
-                return row["count"] if row else 0
-        except sqlite3.Error as e:
-            logger.error(f"Error getting log count: {e}")
-            return 0
+    try:
+        with _get_reader_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+            return row["count"] if row else 0
+    except sqlite3.Error as e:
+        logger.error(f"Error getting log count: {e}")
+        return 0
+
+
+def get_latest_log_id() -> int:
+    """Get the highest log ID, which changes whenever a log is added."""
+    try:
+        with _get_reader_connection() as conn:
+            row = conn.execute("SELECT MAX(id) FROM logs").fetchone()
+            return row[0] or 0
+    except sqlite3.Error as e:
+        logger.error(f"Error getting latest log ID: {e}")
+        return 0
 
 
 def get_active_camera_ids(seconds_threshold: int = 300) -> List[str]:
@@ -216,16 +384,15 @@ def get_active_camera_ids(seconds_threshold: int = 300) -> List[str]:
     ORDER BY camera_id
     """
     
-    with _db_lock:
-        try:
-            with _get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, (threshold_time,))
-                rows = cursor.fetchall()
-                return [row["camera_id"] for row in rows if row["camera_id"]]
-        except sqlite3.Error as e:
-            logger.error(f"Error getting active camera IDs: {e}")
-            return []
+    try:
+        with _get_reader_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, (threshold_time,))
+            rows = cursor.fetchall()
+            return [row["camera_id"] for row in rows if row["camera_id"]]
+    except sqlite3.Error as e:
+        logger.error(f"Error getting active camera IDs: {e}")
+        return []
 
 
 def get_camera_stats_from_db(camera_id: str, seconds_threshold: int = 300) -> Dict[str, int]:
@@ -250,21 +417,20 @@ def get_camera_stats_from_db(camera_id: str, seconds_threshold: int = 300) -> Di
     
     stats = {'person': 0, 'train': 0, 'total': 0}
     
-    with _db_lock:
-        try:
-            with _get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, (camera_id, threshold_time))
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    class_name = row["class"]
-                    count = row["count"]
-                    if class_name in stats:
-                        stats[class_name] = count
-                    stats['total'] += count
-        except sqlite3.Error as e:
-            logger.error(f"Error getting camera stats from DB: {e}")
+    try:
+        with _get_reader_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, (camera_id, threshold_time))
+            rows = cursor.fetchall()
+            
+            for row in rows:
+                class_name = row["class"]
+                count = row["count"]
+                if class_name in stats:
+                    stats[class_name] = count
+                stats['total'] += count
+    except sqlite3.Error as e:
+        logger.error(f"Error getting camera stats from DB: {e}")
     
     return stats
 